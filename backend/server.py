@@ -1,23 +1,51 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pymongo import MongoClient
+from fastapi.responses import StreamingResponse, PlainTextResponse, FileResponse
+from pymongo import MongoClient, UpdateOne, ReturnDocument
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
 import os
 import hashlib
 import json
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import csv
 import sqlite3
-import pandas as pd
+import pickle
+import urllib.parse
 from datetime import datetime
-from pathlib import Path
 import zipfile
 import plistlib
+import shutil
+import tempfile
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+import asyncio
+import functools
+import collections
+import multiprocessing
+import threading
+import logging
+import time
+import cProfile
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import io
+import re
+import base64
+import fcntl
 import uuid
 
+# Logging: worker processes log through the same configuration
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s")
+logger = logging.getLogger("cyberforensics")
+
 # Initialize FastAPI app
 app = FastAPI(title="CyberForensics Data Extraction Tool", version="1.0.0")
 
@@ -28,17 +56,288 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition", "X-Export-Id", "X-Export-Hash", "X-Profile-File", "Content-Range"],
 )
 
 # MongoDB connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/cyberforensics_db')
-client = MongoClient(MONGO_URL)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 64))
+client = MongoClient(MONGO_URL, maxPoolSize=MONGO_MAX_POOL_SIZE)
 db = client.get_default_database()
 
+# pymongo is blocking, so API handlers run their queries on a dedicated thread
+# pool sized to match the connection pool (started with the app)
+db_executor: Optional[ThreadPoolExecutor] = None
+
 # Collections
 cases_collection = db.cases
 evidence_collection = db.evidence
 exports_collection = db.exports
+# Completed exports kept on disk, keyed by case, data types, format, dedup and
+# the case's evidence_version (bumped on every evidence change)
+export_artifacts_collection = db.export_artifacts
+jobs_collection = db.jobs
+evidence_members_collection = db.evidence_members
+
+# Resumable uploads: {"upload_id": ..., "chunks": {"<index>": <sha256>}, "status": ...}
+# Chunks are written straight to their offset in a preallocated scratch file
+upload_sessions_collection = db.upload_sessions
+
+# Content-addressed cache of parsed evidence: {"file_hash": ..., "evidence_id": ...}
+# maps a SHA-512 to the evidence whose records hold that file's parsed data.
+# Every evidence document names the records it uses in "records_evidence_id".
+evidence_cache_collection = db.evidence_cache
+
+# Delta ingest high-water marks, one document per (case_id, device_id, table):
+# {"column": "rowid" or a date column, "value": <last extracted>, "evidence_id": ...}
+ingest_watermarks_collection = db.ingest_watermarks
+
+# Parsed records live in one collection per data type, one document per record:
+# {"case_id": ..., "evidence_id": ..., "record": {<extracted columns>}, <derived fields>}
+messages_collection = db.messages
+contacts_collection = db.contacts
+call_logs_collection = db.call_logs
+
+RECORD_COLLECTIONS = {
+    "messages": messages_collection,
+    "contacts": contacts_collection,
+    "call_logs": call_logs_collection
+}
+INSERT_BATCH_SIZE = int(os.environ.get('INSERT_BATCH_SIZE', 1000))
+
+# Aggregates maintained at ingest, one document per (evidence_id, kind, key):
+# {"kind": "day", "key": "YYYY-MM-DD", "data_type": ..., "count": n} and
+# {"kind": "counterparty", "key": <phone>, "messages": n, "calls": n, "call_duration": s}
+rollups_collection = db.record_rollups
+ROLLUP_FLUSH_SIZE = int(os.environ.get('ROLLUP_FLUSH_SIZE', 10000))
+
+# Message text is copied into "search_text", which carries the full-text index
+MESSAGE_TEXT_FIELDS = ["body", "text", "message", "content", "snippet"]
+SEARCH_MAX_PAGE_SIZE = 200
+
+# Derived browse fields: "timestamp" (epoch ms, 0 when unknown), "phone" (digits
+# only) and "table". Record pages are ordered by (timestamp, _id).
+TIMESTAMP_FIELDS = ["date", "timestamp", "time"]
+MAX_TIMESTAMP_MS = 253402300799999  # 9999-12-31T23:59:59.999Z
+PHONE_FIELDS = ["address", "number", "phone", "phone_number"]
+RECORDS_MAX_PAGE_SIZE = 1000
+
+# SQLite extraction: candidate tables per data type, read SQLITE_FETCH_SIZE rows at a time
+SQLITE_TABLES = {
+    "messages": ['sms', 'messages', 'message'],  # common Android SMS/MMS tables
+    "contacts": ['contacts', 'contact', 'phone_book'],
+    "call_logs": ['calls', 'call_log', 'call_history']
+}
+SQLITE_FETCH_SIZE = int(os.environ.get('SQLITE_FETCH_SIZE', 1000))
+
+# List views only fetch metadata and the record counts stored at ingest
+CASE_LIST_PROJECTION = {"data": 0}
+EVIDENCE_LIST_PROJECTION = {"data": 0}
+
+# Export streaming
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 64 * 1024))
+EXPORT_ARTIFACT_DIR = os.environ.get('EXPORT_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'cyberforensics_exports'))
+# Completed exports stay in EXPORT_ARTIFACT_DIR (named by export_id, recorded as
+# the export's "stored_path") after their cache entry is retired, so past
+# exports can be re-verified; with RETAIN_EXPORTS off they are deleted instead
+RETAIN_EXPORTS = os.environ.get('RETAIN_EXPORTS', '1').lower() in ('1', 'true', 'yes')
+
+# Export formats: media type and file extension of the download
+EXPORT_FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("application/zip", "zip"),
+    "parquet": ("application/zip", "zip"),
+    "arrow": ("application/zip", "zip")
+}
+
+# NDJSON lines are encoded with orjson (datetimes natively, bytes as base64)
+NDJSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+# Columnar exports: one compressed Parquet or Arrow IPC file per data type,
+# written a row group at a time; member name extension per format
+COLUMNAR_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+COLUMNAR_COMPRESSION = os.environ.get('COLUMNAR_COMPRESSION', 'zstd')
+PARQUET_ROW_GROUP_SIZE = int(os.environ.get('PARQUET_ROW_GROUP_SIZE', 65536))
+
+# Export deduplication: records holding every one of these stable fields are
+# fingerprinted on them; any other record is fingerprinted on every field except
+# provenance, so a partial match never merges distinct records. Fingerprints
+# beyond DEDUP_MEMORY_LIMIT spill to disk.
+DEDUP_FIELDS = {
+    "messages": ["address", "date", "body"],
+    "contacts": ["name", "display_name", "phone", "number", "email"],
+    "call_logs": ["number", "date", "duration", "type"]
+}
+DEDUP_IGNORED_FIELDS = {"_id", "id", "source", "table", "file"}
+DEDUP_MEMORY_LIMIT = int(os.environ.get('DEDUP_MEMORY_LIMIT', 1000000))
+
+# Binary values of at least BLOB_INLINE_LIMIT bytes are moved out of records at
+# ingest into a content-addressed store (BLOB_STORE_DIR/<sha256[:2]>/<sha256>),
+# stored once however often they occur, and replaced by
+# {"blob_ref": <sha256>, "size": <bytes>}; fetch them from /api/blobs/{sha256}
+BLOB_STORE_DIR = os.environ.get('BLOB_STORE_DIR', os.path.join(tempfile.gettempdir(), 'cyberforensics_blobs'))
+BLOB_INLINE_LIMIT = int(os.environ.get('BLOB_INLINE_LIMIT', 1024))
+
+# Evidence files are kept after ingest in a content-addressed store
+# (EVIDENCE_STORE_DIR/<sha512[:2]>/<sha512>) so they can be re-verified later
+RETAIN_EVIDENCE = os.environ.get('RETAIN_EVIDENCE', '1').lower() in ('1', 'true', 'yes')
+EVIDENCE_STORE_DIR = os.environ.get('EVIDENCE_STORE_DIR', os.path.join(tempfile.gettempdir(), 'cyberforensics_evidence'))
+
+# Integrity verification re-hashes stored evidence and export artifacts on a
+# thread pool (hashlib releases the GIL), computing every digest in one read pass
+VERIFY_WORKERS = int(os.environ.get('VERIFY_WORKERS', os.cpu_count() or 1))
+VERIFY_CHUNK_SIZE = int(os.environ.get('VERIFY_CHUNK_SIZE', 1024 * 1024))
+VERIFY_DIGESTS = ("sha512", "sha256", "md5")
+verify_executor: Optional[ThreadPoolExecutor] = None
+verify_tasks = set()  # running verification jobs, referenced until they finish
+
+# Upload handling
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 1024 * 1024))
+SCRATCH_DIR = os.environ.get('SCRATCH_DIR', tempfile.gettempdir())
+UPLOAD_SESSION_CHUNK_SIZE = int(os.environ.get('UPLOAD_SESSION_CHUNK_SIZE', 8 * 1024 * 1024))
+UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get('UPLOAD_MAX_CHUNK_SIZE', 64 * 1024 * 1024))
+
+# Upload session states
+UPLOAD_OPEN = "open"
+UPLOAD_FINALIZING = "finalizing"
+UPLOAD_FINALIZED = "finalized"
+UPLOAD_FAILED = "failed"
+
+# Background ingest: parsing runs in a bounded process pool so the event loop
+# stays responsive. INGEST_QUEUE_LIMIT caps how many jobs may wait for a worker.
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', os.cpu_count() or 1))
+INGEST_QUEUE_LIMIT = int(os.environ.get('INGEST_QUEUE_LIMIT', 32))
+ingest_executor: Optional[ProcessPoolExecutor] = None
+ingest_executor_lock = threading.Lock()
+ingest_slots = threading.BoundedSemaphore(INGEST_WORKERS + INGEST_QUEUE_LIMIT)
+
+# Worker processes used to parse the members of a single backup archive in
+# parallel. Each ingest worker may run such a pool, so by default the cores are
+# shared out between them instead of every ingest claiming all of them.
+BACKUP_PARSE_WORKERS = int(os.environ.get('BACKUP_PARSE_WORKERS', max(1, (os.cpu_count() or 1) // INGEST_WORKERS)))
+# Parsed members waiting to be replayed, per backup parse worker; bounds the
+# spool files kept in scratch at once
+BACKUP_PARSE_IN_FLIGHT = int(os.environ.get('BACKUP_PARSE_IN_FLIGHT', 2))
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Integrity verification results per item
+VERIFY_PASS = "pass"
+VERIFY_FAIL = "fail"
+VERIFY_MISSING = "missing"
+VERIFY_ERROR = "error"  # the file exists but could not be read
+
+# Opt-in request profiling: with PROFILING_ENABLED set, requests sent with an
+# "X-Profile: 1" header are run under cProfile and the stats dumped to PROFILE_DIR
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'cyberforensics_profiles'))
+
+# Metrics, exported on /api/metrics in Prometheus text format
+METRIC_PREFIX = "cyberforensics_"
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float("inf"))
+METRIC_HELP = {
+    "upload_bytes_total": ("counter", "Evidence bytes received"),
+    "hashed_bytes_total": ("counter", "Bytes run through SHA-512, by where they were hashed"),
+    "rows_parsed_total": ("counter", "Records parsed, by data type and source table"),
+    "ingest_jobs_total": ("counter", "Finished ingest jobs, by outcome"),
+    "export_bytes_total": ("counter", "Export bytes streamed, by format"),
+    "export_cache_total": ("counter", "Export requests by artifact cache result"),
+    "blob_bytes_total": ("counter", "Binary bytes moved to the blob store, by whether they were new"),
+    "stage_seconds": ("histogram", "Time spent per upload, ingest and export stage"),
+    "insert_batch_seconds": ("histogram", "Latency of one record insert_many batch, by data type"),
+    "verified_items_total": ("counter", "Items re-hashed by integrity verification, by kind and result"),
+    "verified_bytes_total": ("counter", "Bytes re-hashed by integrity verification, by kind")
+}
+
+class MetricsRegistry:
+    """In-process counters and histograms, rendered in Prometheus text format.
+
+    Ingest jobs record into their own registry and hand back a snapshot, which
+    the API process merges, so worker processes never have to share state.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+    
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Add to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record one duration in a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.setdefault(key, [0, 0.0, [0] * len(METRIC_BUCKETS)])
+            histogram[0] += 1
+            histogram[1] += seconds
+            for i, bound in enumerate(METRIC_BUCKETS):
+                if seconds <= bound:
+                    histogram[2][i] += 1
+    
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe how long the block takes"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Picklable copy of every metric"""
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {key: [h[0], h[1], list(h[2])] for key, h in self.histograms.items()}
+            }
+    
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Add a snapshot (e.g. from an ingest worker) into this registry"""
+        with self.lock:
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, (count, total, buckets) in snapshot["histograms"].items():
+                histogram = self.histograms.setdefault(key, [0, 0.0, [0] * len(METRIC_BUCKETS)])
+                histogram[0] += count
+                histogram[1] += total
+                histogram[2] = [a + b for a, b in zip(histogram[2], buckets)]
+    
+    def render(self) -> str:
+        """Prometheus text exposition of every metric"""
+        def label_text(labels, extra=()):
+            escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs = [f'{k}="{escape(v)}"' for k, v in labels + tuple(extra)]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+        
+        snapshot = self.snapshot()
+        lines = []
+        for name, (metric_type, help_text) in METRIC_HELP.items():
+            lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} {metric_type}")
+            for (key_name, labels), value in sorted(snapshot["counters"].items()):
+                if key_name == name:
+                    lines.append(f"{METRIC_PREFIX}{name}{label_text(labels)} {value:g}")
+            for (key_name, labels), (count, total, buckets) in sorted(snapshot["histograms"].items()):
+                if key_name != name:
+                    continue
+                for bound, bucket_count in zip(METRIC_BUCKETS, buckets):
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{label_text(labels, [('le', le)])} {bucket_count}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{label_text(labels)} {total:.6f}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
 
 # Models
 class CaseCreate(BaseModel):
@@ -46,124 +345,1630 @@ class CaseCreate(BaseModel):
     investigator: str
     description: Optional[str] = ""
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    file_size: int
+    chunk_size: Optional[int] = None  # defaults to UPLOAD_SESSION_CHUNK_SIZE
+    delta: bool = False  # store only rows added since the device's previous delta upload
+    device_id: Optional[str] = None  # required with delta
+
 class ExportRequest(BaseModel):
     case_id: str
     data_types: List[str]  # ['messages', 'contacts', 'call_logs']
     export_format: str  # 'json' or 'csv'
+    deduplicate: bool = False  # drop records repeated across overlapping evidence
 
 # Utility functions
 def calculate_hash(data: bytes) -> str:
     """Calculate SHA-512 hash of data"""
     return hashlib.sha512(data).hexdigest()
 
+async def spool_upload(file: UploadFile, dest_path: str) -> Tuple[int, str]:
+    """Stream an upload to disk in fixed-size chunks, hashing as it goes.
+
+    Peak memory is bounded by UPLOAD_CHUNK_SIZE regardless of evidence size.
+    Returns the number of bytes written and the SHA-512 of the content.
+    """
+    hasher = hashlib.sha512()
+    file_size = 0
+    timings = {"upload_read": 0.0, "upload_hash": 0.0, "upload_write": 0.0}
+    with open(dest_path, "wb") as f:
+        while True:
+            start = time.perf_counter()
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            timings["upload_read"] += time.perf_counter() - start
+            if not chunk:
+                break
+            start = time.perf_counter()
+            hasher.update(chunk)
+            timings["upload_hash"] += time.perf_counter() - start
+            start = time.perf_counter()
+            await run_in_threadpool(f.write, chunk)
+            timings["upload_write"] += time.perf_counter() - start
+            file_size += len(chunk)
+    
+    for stage, seconds in timings.items():
+        metrics.observe("stage_seconds", seconds, stage=stage)
+    metrics.inc("upload_bytes_total", file_size)
+    metrics.inc("hashed_bytes_total", file_size, stage="upload")
+    return file_size, hasher.hexdigest()
+
+def merkle_root(leaf_hashes: List[str]) -> str:
+    """SHA-256 Merkle root over chunk hashes (in chunk order); an odd node is carried up as is"""
+    level = [bytes.fromhex(leaf) for leaf in leaf_hashes]
+    while len(level) > 1:
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest() if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+def hash_upload_chunks(path: str, chunk_size: int, total_chunks: int) -> Tuple[str, List[str]]:
+    """SHA-512 of an assembled upload and the SHA-256 of each of its chunks, in one read pass"""
+    hasher = hashlib.sha512()
+    chunk_hashes = []
+    with open(path, "rb") as f:
+        for _ in range(total_chunks):
+            chunk_hasher = hashlib.sha256()
+            remaining = chunk_size
+            while remaining:
+                piece = f.read(min(remaining, UPLOAD_CHUNK_SIZE))
+                if not piece:
+                    break
+                hasher.update(piece)
+                chunk_hasher.update(piece)
+                remaining -= len(piece)
+            chunk_hashes.append(chunk_hasher.hexdigest())
+    return hasher.hexdigest(), chunk_hashes
+
+def write_chunk(path: str, offset: int, data: bytes) -> None:
+    """Write a chunk at its offset; concurrent chunks of one upload never overlap.
+
+    Raises FileNotFoundError once seal_upload_file has moved the file away.
+    """
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        # The file may have been sealed between the open and the lock
+        if not os.path.exists(path) or not os.path.samestat(os.fstat(fd), os.stat(path)):
+            raise FileNotFoundError(path)
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+
+def seal_upload_file(path: str) -> str:
+    """Move an upload's file where chunk writes cannot open it and wait out those in progress"""
+    sealed_dir = os.path.join(os.path.dirname(path), "sealed")
+    os.makedirs(sealed_dir, exist_ok=True)
+    sealed = os.path.join(sealed_dir, os.path.basename(path))
+    os.rename(path, sealed)
+    fd = os.open(sealed, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    finally:
+        os.close(fd)
+    return sealed
+
+def normalize_phone(value: str) -> str:
+    """Reduce a phone number to its digits so formatting differences don't matter"""
+    return re.sub(r"\D", "", value)
+
+def record_document(case_id: str, evidence_id: str, data_type: str, record: Dict) -> Dict[str, Any]:
+    """Build the stored document for a parsed record, including derived query fields"""
+    doc = {
+        "case_id": case_id,
+        "evidence_id": evidence_id,
+        "record": record,
+        "table": record.get("table"),
+        "timestamp": 0
+    }
+    
+    for field in TIMESTAMP_FIELDS:
+        value = record.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            # Android stores epoch milliseconds; treat small values as epoch seconds
+            timestamp = value if value >= 10 ** 11 else value * 1000
+            if timestamp <= MAX_TIMESTAMP_MS:
+                doc["timestamp"] = int(timestamp)
+            break
+    
+    for field in PHONE_FIELDS:
+        if record.get(field):
+            phone = normalize_phone(str(record[field]))
+            if phone:
+                doc["phone"] = phone
+                break
+    
+    if data_type == "messages":
+        for field in MESSAGE_TEXT_FIELDS:
+            if isinstance(record.get(field), str) and record[field]:
+                doc["search_text"] = record[field]
+                break
+    
+    return doc
+
+def blob_path(sha256: str) -> str:
+    """Location of a blob in the content-addressed store"""
+    return os.path.join(BLOB_STORE_DIR, sha256[:2], sha256)
+
+def store_blob(data: bytes) -> Tuple[str, bool]:
+    """Store bytes in the blob store once; returns the SHA-256 and whether they were new"""
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        return sha256, False
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".partial", dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return sha256, True
+
+def evidence_store_path(file_hash: str) -> str:
+    """Location of a retained evidence file in the content-addressed store"""
+    return os.path.join(EVIDENCE_STORE_DIR, file_hash[:2], file_hash)
+
+def retain_evidence_file(file_path: str, file_hash: str) -> Optional[str]:
+    """Move an ingested evidence file into the evidence store, once per SHA-512"""
+    if not RETAIN_EVIDENCE:
+        return None
+    path = evidence_store_path(file_hash)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".partial", dir=os.path.dirname(path))
+        os.close(fd)
+        shutil.move(file_path, temp_path)
+        os.replace(temp_path, path)
+    return path
+
+def release_evidence_file(file_hash: str) -> None:
+    """Drop a retained evidence file once no evidence has that SHA-512"""
+    if not file_hash or evidence_collection.find_one({"file_hash": file_hash}, {"_id": 1}):
+        return
+    try:
+        os.remove(evidence_store_path(file_hash))
+    except FileNotFoundError:
+        pass
+
+def offload_blobs(value: Any, registry: MetricsRegistry) -> Any:
+    """Replace large binary values (at any depth) with blob store references"""
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) < BLOB_INLINE_LIMIT:
+            return value
+        sha256, stored = store_blob(bytes(value))
+        registry.inc("blob_bytes_total", len(value), result="stored" if stored else "deduplicated")
+        return {"blob_ref": sha256, "size": len(value)}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (bytes, bytearray, dict, list)):
+                value[key] = offload_blobs(item, registry)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, (bytes, bytearray, dict, list)):
+                value[index] = offload_blobs(item, registry)
+    return value
+
+class RecordRollups:
+    """Accumulate per-day and per-counterparty counts and apply them as $inc upserts"""
+    
+    def __init__(self, evidence_id: str, flush_size: int = ROLLUP_FLUSH_SIZE):
+        self.evidence_id = evidence_id
+        self.flush_size = flush_size
+        self.days = {}
+        self.counterparties = {}
+    
+    def add(self, data_type: str, doc: Dict) -> None:
+        """Count one stored record document"""
+        if doc["timestamp"]:
+            day = datetime.utcfromtimestamp(doc["timestamp"] / 1000).strftime("%Y-%m-%d")
+            self.days[(day, data_type)] = self.days.get((day, data_type), 0) + 1
+        
+        if doc.get("phone") and data_type != "contacts":
+            totals = self.counterparties.setdefault(doc["phone"], {"messages": 0, "calls": 0, "call_duration": 0})
+            if data_type == "messages":
+                totals["messages"] += 1
+            else:
+                totals["calls"] += 1
+                duration = doc["record"].get("duration")
+                if isinstance(duration, (int, float)) and not isinstance(duration, bool):
+                    totals["call_duration"] += duration
+        
+        if len(self.days) + len(self.counterparties) >= self.flush_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Add the accumulated counts to the stored rollups"""
+        updates = [
+            UpdateOne(
+                {"evidence_id": self.evidence_id, "kind": "day", "key": day, "data_type": data_type},
+                {"$inc": {"count": count}},
+                upsert=True
+            )
+            for (day, data_type), count in self.days.items()
+        ]
+        updates.extend(
+            UpdateOne(
+                {"evidence_id": self.evidence_id, "kind": "counterparty", "key": phone},
+                {"$inc": totals},
+                upsert=True
+            )
+            for phone, totals in self.counterparties.items()
+        )
+        if updates:
+            rollups_collection.bulk_write(updates, ordered=False)
+        self.days = {}
+        self.counterparties = {}
+
+class RecordWriter:
+    """Buffer parsed records and store them with batched, unordered insert_many calls"""
+    
+    def __init__(self, case_id: str, evidence_id: str, batch_size: int = INSERT_BATCH_SIZE,
+                 registry: Optional[MetricsRegistry] = None):
+        self.case_id = case_id
+        self.evidence_id = evidence_id
+        self.batch_size = batch_size
+        self.metrics = registry or metrics
+        self.buffers = {data_type: [] for data_type in RECORD_COLLECTIONS}
+        self.counts = {data_type: 0 for data_type in RECORD_COLLECTIONS}
+        self.rollups = RecordRollups(evidence_id)
+    
+    def add(self, data_type: str, records: List[Dict]) -> None:
+        """Queue records of one data type, flushing full batches"""
+        buffer = self.buffers[data_type]
+        for record in records:
+            offload_blobs(record, self.metrics)
+            doc = record_document(self.case_id, self.evidence_id, data_type, record)
+            self.rollups.add(data_type, doc)
+            buffer.append(doc)
+            if len(buffer) >= self.batch_size:
+                self.flush(data_type)
+                buffer = self.buffers[data_type]
+    
+    def flush(self, data_type: Optional[str] = None) -> None:
+        """Write buffered records of one data type (or all of them)"""
+        for name in [data_type] if data_type else list(self.buffers):
+            buffer = self.buffers[name]
+            if buffer:
+                with self.metrics.time("insert_batch_seconds", data_type=name):
+                    RECORD_COLLECTIONS[name].insert_many(buffer, ordered=False)
+                self.counts[name] += len(buffer)
+                self.buffers[name] = []
+        if not data_type:
+            self.rollups.flush()
+
+def delete_evidence_records(evidence_id: str) -> None:
+    """Remove every parsed record belonging to an evidence item"""
+    for collection in RECORD_COLLECTIONS.values():
+        collection.delete_many({"evidence_id": evidence_id})
+    evidence_members_collection.delete_many({"evidence_id": evidence_id})
+    rollups_collection.delete_many({"evidence_id": evidence_id})
+
+def collect_unreferenced_records(records_evidence_id: str) -> bool:
+    """Drop parsed records (and their cache entry) once no evidence references them"""
+    if evidence_collection.find_one({"records_evidence_id": records_evidence_id}, {"_id": 1}):
+        return False
+    evidence_cache_collection.delete_many({"evidence_id": records_evidence_id})
+    delete_evidence_records(records_evidence_id)
+    return True
+
+def case_record_sources(case_id: str) -> List[str]:
+    """Evidence ids whose records make up a case (shared records are listed once)"""
+    sources = evidence_collection.distinct(
+        "records_evidence_id", {"case_id": case_id, "processed": True}
+    )
+    return sorted(source for source in sources if source)
+
+def case_uses_records(case_id: str, records_evidence_id: str) -> bool:
+    """Whether a processed evidence item of the case already reads these records"""
+    return evidence_collection.find_one(
+        {"case_id": case_id, "processed": True, "records_evidence_id": records_evidence_id}, {"_id": 1}
+    ) is not None
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking database call on the database thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
+
 def create_evidence_timestamp() -> str:
     """Create forensics-grade timestamp"""
     return datetime.utcnow().isoformat() + "Z"
 
+def open_evidence_db(file_path: str) -> sqlite3.Connection:
+    """Open an evidence database read-only and immutable.
+
+    immutable=1 tells SQLite the file cannot change, so it skips journal and
+    lock handling entirely and never writes to the evidence.
+    """
+    uri = f"file:{urllib.parse.quote(os.path.abspath(file_path))}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
+
+def watermark_column(conn: sqlite3.Connection, table: str) -> Optional[str]:
+    """Column a table's rows can be extracted in order of: rowid, else a date column"""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+    if "WITHOUT ROWID" not in (row[0] or "").upper():
+        return "rowid"
+    columns = {info[1] for info in conn.execute(f'PRAGMA table_info("{table}")')}
+    return next((field for field in TIMESTAMP_FIELDS if field in columns), None)
+
+def iter_sqlite_records(file_path: str, batch_size: int = SQLITE_FETCH_SIZE,
+                        watermarks: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """Stream records from an Android/iOS SQLite database as (data_type, records) batches.
+
+    Rows are read with fetchmany, so memory stays bounded by ``batch_size``
+    no matter how large the tables are.
+
+    With ``watermarks`` ({table: {"column": ..., "value": ...}}) only rows past
+    each table's mark are read, in order, and the marks are advanced in place
+    as batches are yielded; tables with no usable column are read in full.
+    """
+    conn = open_evidence_db(file_path)
+    try:
+        # Get all tables
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        tables = {row[0] for row in cursor.fetchall()}
+        
+        for data_type, candidate_tables in SQLITE_TABLES.items():
+            for table in candidate_tables:
+                if table not in tables:
+                    continue
+                try:
+                    column = watermark_column(conn, table) if watermarks is not None else None
+                    if column:
+                        # rowid must stay unquoted: a quoted name that is no column is a string literal
+                        column_sql = column if column == "rowid" else f'"{column}"'
+                        mark = watermarks.get(table)
+                        where, params = "", ()
+                        if mark and mark["column"] == column:
+                            where, params = f" WHERE {column_sql} > ?", (mark["value"],)
+                        cursor = conn.execute(
+                            f'SELECT {column_sql}, * FROM "{table}"{where} ORDER BY {column_sql}', params
+                        )
+                        columns = [description[0] for description in cursor.description][1:]
+                    else:
+                        cursor = conn.execute(f'SELECT * FROM "{table}"')
+                        columns = [description[0] for description in cursor.description]
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        if column:
+                            watermarks[table] = {"column": column, "value": rows[-1][0]}
+                            rows = [row[1:] for row in rows]
+                        records = []
+                        for row in rows:
+                            record = dict(zip(columns, row))
+                            record['source'] = 'android_db'
+                            record['table'] = table
+                            records.append(record)
+                        yield data_type, records
+                except sqlite3.Error as e:
+                    logger.warning("Error parsing table %s of %s: %s", table, file_path, e)
+    finally:
+        conn.close()
+
 def parse_android_db(file_path: str) -> Dict[str, List[Dict]]:
-    """Parse Android SQLite databases"""
+    """Parse Android SQLite databases into memory (use iter_sqlite_records for large files)"""
     data = {"messages": [], "contacts": [], "call_logs": []}
     
     try:
-        conn = sqlite3.connect(file_path)
-        cursor = conn.cursor()
+        for data_type, records in iter_sqlite_records(file_path):
+            data[data_type].extend(records)
+    except Exception as e:
+        logger.warning("Error parsing Android database %s: %s", file_path, e)
+    
+    return data
+
+def iter_database_file(file_path: str,
+                       watermarks: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """Stream record batches from a database file, logging instead of raising on corrupt files"""
+    try:
+        yield from iter_sqlite_records(file_path, watermarks=watermarks)
+    except Exception as e:
+        logger.warning("Error parsing Android database %s: %s", file_path, e)
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+def backup_member_parser(member_name: str, head: bytes) -> Optional[str]:
+    """How a backup member is parsed: "sqlite" (by extension or header), "plist" or None (hashed only)"""
+    lower_name = member_name.lower()
+    if lower_name.endswith(('.db', '.sqlite', '.sqlite3')) or head.startswith(SQLITE_MAGIC):
+        return "sqlite"
+    if lower_name.endswith('.plist'):
+        return "plist"
+    return None
+
+def backup_member_record(info: zipfile.ZipInfo, file_hash: str, parsed_as: Optional[str]) -> Dict[str, Any]:
+    """Integrity record of one backup archive member"""
+    return {
+        "name": info.filename,
+        "file_size": info.file_size,
+        "compressed_size": info.compress_size,
+        "file_hash": file_hash,
+        "parsed_as": parsed_as
+    }
+
+def parse_backup_member(archive: zipfile.ZipFile, scratch_dir: str, member_name: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Hash and parse a single member of a backup archive without extracting the archive.
+
+    The member is streamed through SHA-512. Plists are parsed from the bytes
+    read off the member stream; SQLite databases are copied to a private
+    scratch file, parsed and removed again. Parsed record batches are pickled
+    to a spool file in ``scratch_dir`` so the parent can replay them in a fixed
+    order. Returns the spool path (or None) and the member's integrity record.
+    """
+    hasher = hashlib.sha512()
+    parsed_as = None
+    spool_path = None
+    
+    def spool(batches: Iterator[Tuple[str, List[Dict]]]) -> str:
+        fd, path = tempfile.mkstemp(suffix=".batches", dir=scratch_dir)
+        with os.fdopen(fd, "wb") as f:
+            for batch in batches:
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+    
+    info = archive.getinfo(member_name)
+    with archive.open(info) as member:
+        head = member.read(UPLOAD_CHUNK_SIZE)
+        hasher.update(head)
+        parser = backup_member_parser(member_name, head)
         
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [row[0] for row in cursor.fetchall()]
+        if parser == "sqlite":
+            # SQLite needs a real file; materialize just this member
+            fd, db_path = tempfile.mkstemp(suffix=".db", dir=scratch_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(head)
+                    for chunk in iter(lambda: member.read(UPLOAD_CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+                        f.write(chunk)
+                spool_path = spool(iter_database_file(db_path))  # SQLite parsing works for iOS too
+                parsed_as = "sqlite"
+            finally:
+                os.remove(db_path)
         
-        # Parse messages (common Android SMS/MMS tables)
-        for table in ['sms', 'messages', 'message']:
-            if table in tables:
-                try:
-                    cursor.execute(f"SELECT * FROM {table}")
-                    columns = [description[0] for description in cursor.description]
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        message_data = dict(zip(columns, row))
-                        message_data['source'] = 'android_db'
-                        message_data['table'] = table
-                        data["messages"].append(message_data)
-                except Exception as e:
-                    print(f"Error parsing {table}: {e}")
+        elif parser == "plist":
+            chunks = [head]
+            for chunk in iter(lambda: member.read(UPLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                chunks.append(chunk)
+            try:
+                plist_data = plistlib.loads(b"".join(chunks))
+                # Add plist data with source information
+                plist_entry = {
+                    'source': 'ios_plist',
+                    'file': os.path.basename(member_name),
+                    'data': plist_data
+                }
+                # Most plist files are contact-related
+                spool_path = spool(iter([("contacts", [plist_entry])]))
+                parsed_as = "plist"
+            except Exception as e:
+                logger.warning("Error parsing plist %s: %s", member_name, e)
         
-        # Parse contacts
-        for table in ['contacts', 'contact', 'phone_book']:
-            if table in tables:
-                try:
-                    cursor.execute(f"SELECT * FROM {table}")
-                    columns = [description[0] for description in cursor.description]
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        contact_data = dict(zip(columns, row))
-                        contact_data['source'] = 'android_db'
-                        contact_data['table'] = table
-                        data["contacts"].append(contact_data)
-                except Exception as e:
-                    print(f"Error parsing {table}: {e}")
+        else:
+            for chunk in iter(lambda: member.read(UPLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+    
+    return spool_path, backup_member_record(info, hasher.hexdigest(), parsed_as)
+
+# Backup parse workers open the archive once, when they start, instead of
+# re-reading its central directory for every member
+_worker_archive: Optional[zipfile.ZipFile] = None
+
+def open_worker_archive(archive_path: str) -> None:
+    """Backup parse pool initializer: open the archive for this worker's lifetime"""
+    global _worker_archive
+    _worker_archive = zipfile.ZipFile(archive_path, 'r')
+
+def parse_worker_member(scratch_dir: str, member_name: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Parse one backup member from the archive opened by open_worker_archive"""
+    return parse_backup_member(_worker_archive, scratch_dir, member_name)
+
+def iter_backup_records(archive_path: str, scratch_dir: str,
+                        members: List[Dict[str, Any]]) -> Iterator[Tuple[str, List[Dict]]]:
+    """Stream record batches from an iOS (or Android) backup archive, read in place
+
+    The archive is read in one sequential pass in member-name order: members
+    that are only hashed are hashed right there, while SQLite databases and
+    plists go to BACKUP_PARSE_WORKERS processes, at most
+    BACKUP_PARSE_IN_FLIGHT per worker at a time. Results are replayed in
+    member-name order as soon as they are ready, so records are stored while
+    the archive is still being read, only a few parsed spools sit in
+    ``scratch_dir`` at once, and the outcome does not depend on which worker
+    finishes first. One integrity record per member is appended to ``members``.
+    """
+    with zipfile.ZipFile(archive_path, 'r') as archive:
+        infos = sorted((info for info in archive.infolist() if not info.is_dir()), key=lambda info: info.filename)
+        workers = min(BACKUP_PARSE_WORKERS, len(infos))
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=open_worker_archive,
+                initargs=(archive_path,)
+            )
+        in_flight_limit = max(1, workers) * BACKUP_PARSE_IN_FLIGHT
         
-        # Parse call logs
-        for table in ['calls', 'call_log', 'call_history']:
-            if table in tables:
-                try:
-                    cursor.execute(f"SELECT * FROM {table}")
-                    columns = [description[0] for description in cursor.description]
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        call_data = dict(zip(columns, row))
-                        call_data['source'] = 'android_db'
-                        call_data['table'] = table
-                        data["call_logs"].append(call_data)
-                except Exception as e:
-                    print(f"Error parsing {table}: {e}")
+        def replay(entry) -> Iterator[Tuple[str, List[Dict]]]:
+            if isinstance(entry, Future):
+                entry = entry.result()
+            elif isinstance(entry, str):
+                entry = parse_backup_member(archive, scratch_dir, entry)
+            spool_path, member_record = entry
+            members.append(member_record)
+            if not spool_path:
+                return
+            try:
+                with open(spool_path, "rb") as f:
+                    while True:
+                        try:
+                            yield pickle.load(f)
+                        except EOFError:
+                            break
+            finally:
+                os.remove(spool_path)
         
-        conn.close()
+        try:
+            # Entries in member order: a pool future, a member name to parse
+            # inline, or a finished (spool_path, member_record) result
+            pending = collections.deque()
+            in_flight = 0
+            for info in infos:
+                with archive.open(info) as member:
+                    head = member.read(len(SQLITE_MAGIC))
+                    if backup_member_parser(info.filename, head):
+                        if executor:
+                            pending.append(executor.submit(parse_worker_member, scratch_dir, info.filename))
+                            in_flight += 1
+                        else:
+                            pending.append(info.filename)
+                    else:
+                        hasher = hashlib.sha512(head)
+                        for chunk in iter(lambda: member.read(UPLOAD_CHUNK_SIZE), b""):
+                            hasher.update(chunk)
+                        pending.append((None, backup_member_record(info, hasher.hexdigest(), None)))
+                
+                # Replay whatever is ready at the head; wait for it once the pool is full
+                while pending and (not isinstance(pending[0], Future) or pending[0].done() or in_flight >= in_flight_limit):
+                    entry = pending.popleft()
+                    if isinstance(entry, Future):
+                        in_flight -= 1
+                    yield from replay(entry)
+            
+            while pending:
+                yield from replay(pending.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+def iter_evidence_records(file_path: str, filename: str, scratch_dir: str, members: List[Dict[str, Any]],
+                          watermarks: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """Stream (data_type, records) batches from an evidence file based on its type
+
+    For archives, one integrity record per member is appended to ``members``.
+    ``watermarks`` limits database files to rows newer than a previous
+    acquisition (see iter_sqlite_records); archives are always read in full.
+    """
+    if filename.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        # Android/iOS SQLite database
+        return iter_database_file(file_path, watermarks)
+    elif filename.lower().endswith('.zip'):
+        # iOS backup or Android backup archive, read member by member
+        return iter_backup_records(file_path, scratch_dir, members)
+    else:
+        # Try to parse as SQLite database anyway
+        return iter_database_file(file_path, watermarks)
+
+def load_ingest_watermarks(case_id: str, device_id: str) -> Dict[str, Dict[str, Any]]:
+    """High-water marks left by a device's previous delta ingests in a case, with the evidence that set them"""
+    return {
+        mark["table"]: {"column": mark["column"], "value": mark["value"], "evidence_id": mark["evidence_id"]}
+        for mark in ingest_watermarks_collection.find({"case_id": case_id, "device_id": device_id})
+    }
+
+def save_ingest_watermarks(case_id: str, device_id: str, evidence_id: str,
+                           watermarks: Dict[str, Dict[str, Any]], previous: Dict[str, Dict[str, Any]]) -> None:
+    """Store the marks a delta ingest advanced (extraction replaces those it moves)"""
+    operations = [
+        UpdateOne(
+            {"case_id": case_id, "device_id": device_id, "table": table},
+            {"$set": {**mark, "evidence_id": evidence_id, "updated_at": create_evidence_timestamp()}},
+            upsert=True
+        )
+        for table, mark in watermarks.items() if mark != previous.get(table)
+    ]
+    if operations:
+        ingest_watermarks_collection.bulk_write(operations, ordered=False)
+
+def restore_ingest_watermarks(evidence: Dict[str, Any]) -> None:
+    """Move the marks a deleted delta evidence set back to where it started.
+
+    The next delta then re-reads just that evidence's rows; tables it was the
+    first to mark are read in full again. Only the latest acquisition built on
+    the marks can be rewound this way, so delete_evidence refuses the others
+    (see delta_dependents).
+    """
+    delta_from = {mark["table"]: mark for mark in evidence.get("delta_from", [])}
+    for mark in ingest_watermarks_collection.find({"evidence_id": evidence["evidence_id"]}, {"table": 1}):
+        base = delta_from.get(mark["table"])
+        if base:
+            ingest_watermarks_collection.update_one(
+                {"_id": mark["_id"]},
+                {"$set": {
+                    "column": base["column"],
+                    "value": base["value"],
+                    "evidence_id": base.get("evidence_id"),
+                    "updated_at": create_evidence_timestamp()
+                }}
+            )
+        else:
+            ingest_watermarks_collection.delete_one({"_id": mark["_id"]})
+
+def mark_ingest_failed(job_id: str, error: str) -> None:
+    """Record a failed ingest on its job and on the evidence, which may then be deleted"""
+    jobs_collection.update_one(
+        {"job_id": job_id, "status": {"$in": [JOB_QUEUED, JOB_RUNNING]}},
+        {"$set": {"status": JOB_FAILED, "error": error, "finished_at": create_evidence_timestamp()}}
+    )
+    evidence_collection.update_one(
+        {"job_id": job_id, "processed": False},
+        {"$set": {"status": JOB_FAILED, "error": error}}
+    )
+
+def delta_dependents(evidence: Dict[str, Any]) -> bool:
+    """Whether later delta ingests of the same device build on this evidence's marks"""
+    if not evidence.get("delta"):
+        return False
+    return evidence_collection.find_one({
+        "case_id": evidence["case_id"],
+        "device_id": evidence["device_id"],
+        "evidence_id": {"$ne": evidence["evidence_id"]},
+        "$or": [
+            {"delta_from.evidence_id": evidence["evidence_id"]},
+            # A queued or running delta has read the marks but not yet recorded them
+            {"processed": False, "status": {"$ne": JOB_FAILED}}
+        ]
+    }, {"_id": 1}) is not None
+
+def run_ingest_job(job_id: str, case_id: str, evidence_id: str, file_path: str, filename: str,
+                   file_hash: str, scratch_dir: str, delta_device: Optional[str] = None) -> Dict[str, Any]:
+    """Parse an uploaded evidence file and store the results.
+
+    Runs inside an ingest worker process, which has its own MongoDB client.
+    With ``delta_device`` only rows newer than that device's previous delta
+    ingest in the case are stored. Returns a snapshot of the job's metrics for
+    the API process to merge.
+    """
+    job_metrics = MetricsRegistry()
+    job_start = time.perf_counter()
+    jobs_collection.update_one(
+        {"job_id": job_id},
+        {"$set": {"status": JOB_RUNNING, "started_at": create_evidence_timestamp()}}
+    )
+    
+    try:
+        # Record batches go straight from the parser to the storage layer
+        writer = RecordWriter(case_id, evidence_id, registry=job_metrics)
+        members = []
+        previous_marks = load_ingest_watermarks(case_id, delta_device) if delta_device else {}
+        watermarks = dict(previous_marks) if delta_device else None
+        parse_seconds = store_seconds = 0.0
+        batches = iter_evidence_records(file_path, filename, scratch_dir, members, watermarks)
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            parse_seconds += time.perf_counter() - start
+            if batch is None:
+                break
+            
+            data_type, records = batch
+            start = time.perf_counter()
+            writer.add(data_type, records)
+            jobs_collection.update_one({"job_id": job_id}, {"$inc": {"rows_parsed": len(records)}})
+            store_seconds += time.perf_counter() - start
+            # Extractors yield one table per batch
+            job_metrics.inc("rows_parsed_total", len(records), data_type=data_type, table=records[0].get("table", ""))
         
+        start = time.perf_counter()
+        writer.flush()
+        store_seconds += time.perf_counter() - start
+        job_metrics.observe("stage_seconds", parse_seconds, stage="parse")
+        job_metrics.observe("stage_seconds", store_seconds, stage="store")
+        
+        if members:
+            job_metrics.inc("hashed_bytes_total", sum(member["file_size"] for member in members), stage="backup_member")
+            for member in members:
+                member.update({"case_id": case_id, "evidence_id": evidence_id})
+            evidence_members_collection.insert_many(members, ordered=False)
+        
+        summary = {
+            "messages_count": writer.counts["messages"],
+            "contacts_count": writer.counts["contacts"],
+            "call_logs_count": writer.counts["call_logs"]
+        }
+        
+        # Keep the original file for later integrity verification
+        stored_path = retain_evidence_file(file_path, file_hash)
+        
+        # Store the record counts once so list views never have to count records
+        evidence_update = {"processed": True, "summary": summary, "stored_path": stored_path}
+        if delta_device:
+            evidence_update["delta_from"] = [{"table": table, **mark} for table, mark in previous_marks.items()]
+            save_ingest_watermarks(case_id, delta_device, evidence_id, watermarks, previous_marks)
+        evidence_collection.update_one({"evidence_id": evidence_id}, {"$set": evidence_update})
+        record_evidence_change(case_id, summary)
+        
+        # Let identical uploads reuse these records instead of re-parsing; a
+        # delta parse only holds part of its file, so it is never reused
+        if not delta_device:
+            try:
+                evidence_cache_collection.update_one(
+                    {"file_hash": file_hash},
+                    {"$setOnInsert": {
+                        "file_hash": file_hash,
+                        "evidence_id": evidence_id,
+                        "summary": summary,
+                        "created_at": create_evidence_timestamp()
+                    }},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                pass  # a concurrent ingest of the same file registered first
+        
+        jobs_collection.update_one(
+            {"job_id": job_id},
+            {"$set": {
+                "status": JOB_DONE,
+                "summary": summary,
+                "finished_at": create_evidence_timestamp()
+            }}
+        )
+        job_metrics.inc("ingest_jobs_total", status=JOB_DONE)
+        logger.info(
+            "Ingested evidence %s: %d records, parse %.3fs, store %.3fs",
+            evidence_id, sum(summary.values()), parse_seconds, store_seconds
+        )
+    
     except Exception as e:
-        print(f"Error parsing Android database: {e}")
+        logger.exception("Error processing evidence %s", evidence_id)
+        delete_evidence_records(evidence_id)
+        mark_ingest_failed(job_id, str(e))
+        job_metrics.inc("ingest_jobs_total", status=JOB_FAILED)
     
-    return data
+    finally:
+        # Clean up scratch files
+        with job_metrics.time("stage_seconds", stage="cleanup"):
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+    
+    job_metrics.observe("stage_seconds", time.perf_counter() - job_start, stage="ingest")
+    return job_metrics.snapshot()
 
-def parse_ios_backup(backup_path: str) -> Dict[str, List[Dict]]:
-    """Parse iOS backup files"""
-    data = {"messages": [], "contacts": [], "call_logs": []}
+def record_evidence_change(case_id: str, summary_delta: Dict[str, int]) -> None:
+    """Apply an evidence change to the case summary and retire its cached exports"""
+    update = {f"summary.{key}": count for key, count in summary_delta.items()}
+    update["evidence_version"] = 1
+    cases_collection.update_one({"case_id": case_id}, {"$inc": update})
+    invalidate_export_artifacts(case_id)
+
+def remove_export_file(path: str) -> None:
+    """Delete a stored export file unless exports are retained"""
+    if RETAIN_EXPORTS:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def invalidate_export_artifacts(case_id: str) -> None:
+    """Retire every cached export of a case (the files themselves stay if retained)"""
+    for artifact in export_artifacts_collection.find({"case_id": case_id}, {"path": 1}):
+        remove_export_file(artifact["path"])
+        export_artifacts_collection.delete_one({"_id": artifact["_id"]})
+
+def digest_file(path: str) -> Tuple[Dict[str, str], int]:
+    """Every VERIFY_DIGESTS digest of a file from a single read pass, and its size"""
+    hashers = {name: hashlib.new(name) for name in VERIFY_DIGESTS}
+    buffer = bytearray(VERIFY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            size += read
+            for hasher in hashers.values():
+                hasher.update(view[:read])
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}, size
+
+def verification_items(case_id: str) -> List[Dict[str, Any]]:
+    """The stored evidence files and export artifacts of a case, with their recorded SHA-512"""
+    items = []
+    for evidence in evidence_collection.find(
+        {"case_id": case_id, "processed": True},
+        {"evidence_id": 1, "filename": 1, "file_hash": 1, "file_size": 1, "stored_path": 1}
+    ).sort("uploaded_at", 1):
+        items.append({
+            "kind": "evidence",
+            "id": evidence["evidence_id"],
+            "name": evidence.get("filename"),
+            "path": evidence.get("stored_path"),
+            "expected_sha512": evidence.get("file_hash"),
+            "expected_size": evidence.get("file_size")
+        })
     
+    for export in exports_collection.find(
+        {"case_id": case_id}, {"export_id": 1, "format": 1, "file_hash": 1, "file_size": 1, "stored_path": 1}
+    ).sort("exported_at", 1):
+        items.append({
+            "kind": "export",
+            "id": export["export_id"],
+            "name": export.get("format"),
+            "path": export.get("stored_path"),
+            "expected_sha512": export.get("file_hash"),
+            "expected_size": export.get("file_size")
+        })
+    return items
+
+def verify_item(job_id: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-hash one stored file and compare it with its recorded SHA-512 and size"""
+    start = time.perf_counter()
+    result = {key: item[key] for key in ("kind", "id", "name", "expected_sha512")}
+    size = 0
+    try:
+        if not item["path"]:
+            raise FileNotFoundError(item["id"])
+        digests, size = digest_file(item["path"])
+    except FileNotFoundError:
+        result["status"] = VERIFY_MISSING
+    except OSError as e:
+        # One unreadable file must not abort the rest of the report
+        result.update({"status": VERIFY_ERROR, "error": str(e)})
+    else:
+        intact = digests["sha512"] == item["expected_sha512"] and size == item["expected_size"]
+        result.update(digests)
+        result["status"] = VERIFY_PASS if intact else VERIFY_FAIL
+    result["size"] = size
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    
+    jobs_collection.update_one({"job_id": job_id}, {"$inc": {"items_verified": 1, "bytes_verified": size}})
+    metrics.inc("verified_items_total", kind=item["kind"], result=result["status"])
+    metrics.inc("verified_bytes_total", size, kind=item["kind"])
+    return result
+
+async def run_verify_job(job_id: str, items: List[Dict[str, Any]]) -> None:
+    """Re-hash every item of a verification job in parallel and store the report"""
+    loop = asyncio.get_running_loop()
+    await run_db(
+        jobs_collection.update_one,
+        {"job_id": job_id},
+        {"$set": {"status": JOB_RUNNING, "started_at": create_evidence_timestamp()}}
+    )
+    start = time.perf_counter()
     try:
-        # iOS backups typically contain SQLite databases and plist files
-        backup_dir = Path(backup_path)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(verify_executor, verify_item, job_id, item) for item in items
+        ))
+    except Exception as e:
+        logger.exception("Verification job %s failed", job_id)
+        await run_db(
+            jobs_collection.update_one,
+            {"job_id": job_id},
+            {"$set": {"status": JOB_FAILED, "error": str(e), "finished_at": create_evidence_timestamp()}}
+        )
+        return
+    
+    seconds = time.perf_counter() - start
+    total_bytes = sum(result["size"] for result in results)
+    stats = {
+        "items": len(results),
+        "passed": sum(result["status"] == VERIFY_PASS for result in results),
+        "failed": sum(result["status"] == VERIFY_FAIL for result in results),
+        "missing": sum(result["status"] == VERIFY_MISSING for result in results),
+        "errors": sum(result["status"] == VERIFY_ERROR for result in results),
+        "bytes": total_bytes,
+        "seconds": round(seconds, 6),
+        "bytes_per_second": round(total_bytes / seconds) if seconds else 0,
+        "workers": VERIFY_WORKERS
+    }
+    await run_db(
+        jobs_collection.update_one,
+        {"job_id": job_id},
+        {"$set": {
+            "status": JOB_DONE,
+            "results": results,
+            "stats": stats,
+            "finished_at": create_evidence_timestamp()
+        }}
+    )
+    logger.info(
+        "Verification job %s: %d items, %d passed, %d failed, %d missing, %d errors, %.1f MB/s",
+        job_id, stats["items"], stats["passed"], stats["failed"], stats["missing"], stats["errors"],
+        stats["bytes_per_second"] / 1e6
+    )
+
+def link_cached_evidence(evidence_data: Dict[str, Any], job_data: Dict[str, Any], cached: Dict[str, Any]) -> None:
+    """Attach an already-parsed file's records to a new evidence item"""
+    summary = cached["summary"]
+    evidence_data.update({
+        "records_evidence_id": cached["evidence_id"],
+        "processed": True,
+        "summary": summary
+    })
+    job_data.update({
+        "status": JOB_DONE,
+        "cache_hit": True,
+        "summary": summary,
+        "finished_at": create_evidence_timestamp()
+    })
+    
+    # The case summary counts each set of records once, as browse and export read them
+    counted = case_uses_records(evidence_data["case_id"], cached["evidence_id"])
+    evidence_collection.insert_one(evidence_data)
+    jobs_collection.insert_one(job_data)
+    record_evidence_change(evidence_data["case_id"], {} if counted else summary)
+    evidence_cache_collection.update_one(
+        {"file_hash": cached["file_hash"]},
+        {"$set": {"last_used_at": create_evidence_timestamp()}}
+    )
+
+def _on_ingest_job_finished(job_id: str, scratch_dir: str, executor: ProcessPoolExecutor, future: Future) -> None:
+    """Release the queue slot and record jobs that died with their worker"""
+    ingest_slots.release()
+    error = future.exception() if not future.cancelled() else "Job cancelled"
+    if not error:
+        metrics.merge(future.result())
+    else:
+        logger.error("Ingest job %s died: %s", job_id, error)
+        if isinstance(error, BrokenProcessPool):
+            replace_ingest_executor(executor)
+        metrics.inc("ingest_jobs_total", status=JOB_FAILED)
+        mark_ingest_failed(job_id, str(error))
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+@app.on_event("startup")
+def ensure_indexes():
+    """Create the indexes the API queries rely on"""
+    cases_collection.create_index("case_id", unique=True)
+    evidence_collection.create_index("evidence_id", unique=True)
+    evidence_collection.create_index([("case_id", 1), ("uploaded_at", 1)])
+    evidence_collection.create_index([("case_id", 1), ("processed", 1), ("records_evidence_id", 1)])
+    evidence_collection.create_index("file_hash")
+    exports_collection.create_index("export_id", unique=True)
+    exports_collection.create_index([("case_id", 1), ("exported_at", 1)])
+    jobs_collection.create_index("job_id", unique=True)
+    upload_sessions_collection.create_index("upload_id", unique=True)
+    for collection in RECORD_COLLECTIONS.values():
+        collection.create_index([("case_id", 1), ("evidence_id", 1)])
+        collection.create_index("evidence_id")
+    evidence_members_collection.create_index([("evidence_id", 1), ("name", 1)])
+    # Text searches are run per evidence id, which the index uses as an equality prefix
+    messages_collection.create_index([("evidence_id", 1), ("search_text", "text")], name="message_text_search")
+    # Keyset pagination indexes: equality filters first, then the (timestamp, _id) page order
+    for collection in RECORD_COLLECTIONS.values():
+        collection.create_index([("evidence_id", 1), ("timestamp", 1), ("_id", 1)])
+        collection.create_index([("evidence_id", 1), ("phone", 1), ("timestamp", 1), ("_id", 1)])
+        collection.create_index([("evidence_id", 1), ("table", 1), ("timestamp", 1), ("_id", 1)])
+    evidence_collection.create_index("records_evidence_id")
+    evidence_cache_collection.create_index("file_hash", unique=True)
+    evidence_cache_collection.create_index("evidence_id")
+    export_artifacts_collection.create_index("artifact_key", unique=True)
+    export_artifacts_collection.create_index("case_id")
+    rollups_collection.create_index([("evidence_id", 1), ("kind", 1), ("key", 1), ("data_type", 1)])
+    ingest_watermarks_collection.create_index([("case_id", 1), ("device_id", 1), ("table", 1)], unique=True)
+    ingest_watermarks_collection.create_index("evidence_id")
+
+@app.on_event("startup")
+def start_ingest_workers():
+    """Start the ingest process pool"""
+    global ingest_executor
+    ingest_executor = ProcessPoolExecutor(
+        max_workers=INGEST_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+def replace_ingest_executor(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """Swap a pool broken by a dead worker for a fresh one.
+
+    Once a worker dies (e.g. killed for running out of memory) the pool refuses
+    every further submit, so the first caller to notice starts a new one and
+    later callers holding the same broken pool just pick it up.
+    """
+    with ingest_executor_lock:
+        if ingest_executor is broken:
+            logger.warning("Ingest process pool broke, starting a new one")
+            start_ingest_workers()
+            broken.shutdown(wait=False)
+        return ingest_executor
+
+@app.on_event("shutdown")
+def stop_ingest_workers():
+    """Stop the ingest process pool"""
+    if ingest_executor:
+        ingest_executor.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("startup")
+def start_db_executor():
+    """Start the database thread pool"""
+    global db_executor
+    db_executor = ThreadPoolExecutor(max_workers=MONGO_MAX_POOL_SIZE, thread_name_prefix="mongo")
+
+@app.on_event("shutdown")
+def stop_db_executor():
+    """Stop the database thread pool"""
+    db_executor.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("startup")
+def start_verify_executor():
+    """Start the integrity verification thread pool"""
+    global verify_executor
+    verify_executor = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="verify")
+
+@app.on_event("shutdown")
+def stop_verify_executor():
+    """Stop the integrity verification thread pool"""
+    verify_executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_case_records(case_id: str, data_type: str) -> Iterator[Dict]:
+    """Iterate the records of one data type for a case straight from a database cursor"""
+    cursor = RECORD_COLLECTIONS[data_type].find(
+        {"evidence_id": {"$in": case_record_sources(case_id)}}, {"_id": 0, "record": 1}
+    ).batch_size(EXPORT_BATCH_SIZE)
+    for doc in cursor:
+        yield doc["record"]
+
+class RecordDeduplicator:
+    """Drop records already seen in an export, keyed by a fingerprint of their stable fields.
+
+    Fingerprints are kept in an in-memory set until it holds ``memory_limit``
+    entries; after that they move to an on-disk SQLite set, so very large cases
+    stay memory-bounded without the false positives of a probabilistic filter.
+    """
+    
+    def __init__(self, data_type: str, memory_limit: int = DEDUP_MEMORY_LIMIT):
+        self.fields = DEDUP_FIELDS.get(data_type, [])
+        self.memory_limit = memory_limit
+        self.seen = set()
+        self.spill = None
+        self.spill_path = None
+        self.dropped = 0
+    
+    def fingerprint(self, record: Dict) -> bytes:
+        if self.fields and all(field in record for field in self.fields):
+            fields = self.fields
+        else:
+            fields = sorted(field for field in record if field not in DEDUP_IGNORED_FIELDS)
+        key = json.dumps([[field, record[field]] for field in fields], default=str)
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+    
+    def is_new(self, record: Dict) -> bool:
+        """Remember the record, returning False if an identical one was already seen"""
+        fingerprint = self.fingerprint(record)
         
-        # Look for common iOS database files
-        for file_path in backup_dir.rglob("*.db"):
-            if file_path.is_file():
-                try:
-                    ios_data = parse_android_db(str(file_path))  # SQLite parsing works for iOS too
-                    for key in data.keys():
-                        data[key].extend(ios_data[key])
-                except Exception as e:
-                    print(f"Error parsing iOS DB {file_path}: {e}")
+        if self.spill is None:
+            if fingerprint in self.seen:
+                self.dropped += 1
+                return False
+            self.seen.add(fingerprint)
+            if len(self.seen) >= self.memory_limit:
+                self._spill_to_disk()
+            return True
         
-        # Look for plist files
-        for file_path in backup_dir.rglob("*.plist"):
-            if file_path.is_file():
-                try:
-                    with open(file_path, 'rb') as f:
-                        plist_data = plistlib.load(f)
-                        # Add plist data with source information
-                        plist_entry = {
-                            'source': 'ios_plist',
-                            'file': str(file_path.name),
-                            'data': plist_data
-                        }
-                        data["contacts"].append(plist_entry)  # Most plist files are contact-related
-                except Exception as e:
-                    print(f"Error parsing plist {file_path}: {e}")
+        cursor = self.spill.execute("INSERT OR IGNORE INTO seen VALUES (?)", (fingerprint,))
+        if cursor.rowcount == 0:
+            self.dropped += 1
+            return False
+        return True
     
-    except Exception as e:
-        print(f"Error parsing iOS backup: {e}")
+    def _spill_to_disk(self) -> None:
+        fd, self.spill_path = tempfile.mkstemp(suffix=".dedup", dir=SCRATCH_DIR)
+        os.close(fd)
+        self.spill = sqlite3.connect(self.spill_path, isolation_level=None)
+        self.spill.execute("PRAGMA journal_mode=OFF")
+        self.spill.execute("PRAGMA synchronous=OFF")
+        self.spill.execute("CREATE TABLE seen (fingerprint BLOB PRIMARY KEY) WITHOUT ROWID")
+        self.spill.execute("BEGIN")
+        self.spill.executemany("INSERT INTO seen VALUES (?)", ((f,) for f in self.seen))
+        self.seen = set()
     
-    return data
+    def close(self) -> None:
+        if self.spill is not None:
+            self.spill.close()
+            os.remove(self.spill_path)
+            self.spill = None
+
+def iter_export_records(metadata: Dict[str, Any], data_type: str, dropped: Dict[str, int]) -> Iterator[Dict]:
+    """Iterate a data type's records for an export, deduplicating if the export asks for it.
+
+    The number of duplicates dropped is stored in ``dropped[data_type]``.
+    """
+    records = iter_case_records(metadata["case_id"], data_type)
+    if not metadata.get("deduplicate"):
+        yield from records
+        return
+    
+    deduplicator = RecordDeduplicator(data_type)
+    try:
+        for record in records:
+            if deduplicator.is_new(record):
+                yield record
+    finally:
+        dropped[data_type] = deduplicator.dropped
+        deduplicator.close()
+
+def stream_json_export(metadata: Dict[str, Any]) -> Iterator[bytes]:
+    """Generate a JSON export incrementally, hashing it on the fly.
+
+    The export record (with its SHA-512) is stored once the last byte has been
+    produced, so an interrupted download never gets recorded.
+    """
+    hasher = hashlib.sha512()
+    export_size = 0
+    pending = []
+    pending_size = 0
+    dropped = {}
+    
+    def flush() -> bytes:
+        nonlocal export_size, pending, pending_size
+        chunk = "".join(pending).encode()
+        hasher.update(chunk)
+        export_size += len(chunk)
+        pending = []
+        pending_size = 0
+        return chunk
+    
+    pending.append('{\n  "export_metadata": ' + json.dumps(metadata, default=str) + ',\n  "data": {')
+    for index, data_type in enumerate(RECORD_COLLECTIONS):
+        pending.append(("," if index else "") + f'\n    "{data_type}": [')
+        if data_type in metadata["data_types"]:
+            separator = "\n      "
+            for record in iter_export_records(metadata, data_type, dropped):
+                text = separator + json.dumps(record, default=str)
+                separator = ",\n      "
+                pending.append(text)
+                pending_size += len(text)
+                if pending_size >= EXPORT_CHUNK_SIZE:
+                    yield flush()
+            if separator != "\n      ":
+                pending.append("\n    ")
+        pending.append("]")
+    pending.append("\n  }\n}\n")
+    yield flush()
+    
+    record_export(metadata, hasher.hexdigest(), export_size, duplicates_dropped=dropped)
+
+def _ndjson_default(value: Any) -> Any:
+    """orjson fallback: BLOBs become base64 text, anything else its string form"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+def ndjson_line(value: Dict[str, Any]) -> bytes:
+    """Encode one NDJSON line"""
+    try:
+        return orjson.dumps(value, default=_ndjson_default, option=NDJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which orjson refuses
+        return (json.dumps(value, default=_ndjson_default) + "\n").encode()
+
+def stream_ndjson_export(metadata: Dict[str, Any]) -> Iterator[bytes]:
+    """Generate an NDJSON export: a metadata line, one line per record, then a summary line.
+
+    Record lines are {"data_type": ..., "record": {...}} so the stream can be
+    split or filtered line by line. Hashed and recorded like the JSON export.
+    """
+    hasher = hashlib.sha512()
+    export_size = 0
+    pending = []
+    pending_size = 0
+    dropped = {}
+    counts = {}
+    
+    def flush() -> bytes:
+        nonlocal export_size, pending, pending_size
+        chunk = b"".join(pending)
+        hasher.update(chunk)
+        export_size += len(chunk)
+        pending = []
+        pending_size = 0
+        return chunk
+    
+    pending.append(ndjson_line({"export_metadata": metadata}))
+    for data_type in RECORD_COLLECTIONS:
+        if data_type not in metadata["data_types"]:
+            continue
+        counts[data_type] = 0
+        for record in iter_export_records(metadata, data_type, dropped):
+            line = ndjson_line({"data_type": data_type, "record": record})
+            pending.append(line)
+            pending_size += len(line)
+            counts[data_type] += 1
+            if pending_size >= EXPORT_CHUNK_SIZE:
+                yield flush()
+    pending.append(ndjson_line({"export_summary": {"records": counts, "duplicates_dropped": dropped}}))
+    yield flush()
+    
+    record_export(metadata, hasher.hexdigest(), export_size, duplicates_dropped=dropped)
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that lets a ZipFile be streamed chunk by chunk"""
+    
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.size = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+def _spool_records(metadata: Dict[str, Any], data_type: str, spool, dropped: Dict[str, int]) -> Tuple[List[str], int]:
+    """Copy a data type's records to a JSON-lines spool file in one cursor pass.
+
+    Returns the union of the record columns (in first-seen order) and the row count.
+    """
+    columns = {}
+    rows = 0
+    for record in iter_export_records(metadata, data_type, dropped):
+        for column in record:
+            if column not in columns:
+                columns[column] = None
+        spool.write(json.dumps(record, default=str) + "\n")
+        rows += 1
+    return list(columns), rows
+
+def stream_csv_zip_export(metadata: Dict[str, Any]) -> Iterator[bytes]:
+    """Generate a ZIP with one CSV per data type, streamed as it is written.
+
+    Each data type is spooled to a scratch file in a single cursor pass to learn
+    its column union, then rendered to CSV straight into the ZIP member. The
+    SHA-512 of every member is recorded in a manifest and in the export record.
+    """
+    sink = _StreamBuffer()
+    hasher = hashlib.sha512()
+    export_size = 0
+    members = {}
+    dropped = {}
+    
+    def drain() -> bytes:
+        nonlocal export_size
+        chunk = sink.drain()
+        hasher.update(chunk)
+        export_size += len(chunk)
+        return chunk
+    
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for data_type in metadata["data_types"]:
+            if data_type not in RECORD_COLLECTIONS:
+                continue
+            
+            with tempfile.TemporaryFile("w+", dir=SCRATCH_DIR, encoding="utf-8") as spool:
+                columns, rows = _spool_records(metadata, data_type, spool, dropped)
+                if not rows:
+                    continue
+                spool.seek(0)
+                
+                member_name = f"{data_type}.csv"
+                member_hasher = hashlib.sha512()
+                text = io.StringIO()
+                writer = csv.DictWriter(text, fieldnames=columns, restval="", lineterminator="\n")
+                writer.writeheader()
+                
+                with archive.open(member_name, "w", force_zip64=True) as member:
+                    for line in spool:
+                        writer.writerow(json.loads(line))
+                        if text.tell() >= EXPORT_CHUNK_SIZE:
+                            data = text.getvalue().encode()
+                            text.seek(0)
+                            text.truncate()
+                            member_hasher.update(data)
+                            member.write(data)
+                            if sink.size >= EXPORT_CHUNK_SIZE:
+                                yield drain()
+                    data = text.getvalue().encode()
+                    member_hasher.update(data)
+                    member.write(data)
+                
+                members[member_name] = {
+                    "data_type": data_type,
+                    "rows": rows,
+                    "file_hash": member_hasher.hexdigest()
+                }
+                yield drain()
+        
+        manifest = {"export_metadata": metadata, "members": members, "duplicates_dropped": dropped}
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    
+    yield drain()
+    
+    record_export(metadata, hasher.hexdigest(), export_size, members=members, duplicates_dropped=dropped)
+
+class _HashingWriter(io.RawIOBase):
+    """Writable wrapper that hashes and counts everything passed through to a file"""
+    
+    def __init__(self, raw):
+        super().__init__()
+        self.raw = raw
+        self.hasher = hashlib.sha512()
+        self.size = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.hasher.update(data)
+        self.raw.write(data)
+        self.size += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.size
+
+def _arrow_type(value_types: set):
+    """Arrow type for a column given the Python types seen in it (mixed columns become strings)"""
+    value_types = value_types - {"NoneType"}
+    if value_types <= {"bool"} and value_types:
+        return pa.bool_()
+    if value_types <= {"bool", "int", "wideint"} and value_types:
+        return pa.int64()
+    if value_types <= {"bool", "int", "float"} and value_types:
+        return pa.float64()
+    if value_types == {"bytes"}:
+        return pa.binary()
+    if value_types == {"datetime"}:
+        return pa.timestamp("ms")
+    return pa.string()
+
+def _arrow_value(value: Any, arrow_type) -> Any:
+    """Coerce a record value to its column's Arrow type"""
+    if isinstance(value, bool) and pa.types.is_integer(arrow_type):
+        return int(value)  # Arrow refuses bools in integer columns
+    if value is None or not pa.types.is_string(arrow_type) or isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+def _spool_record_batches(metadata: Dict[str, Any], data_type: str, spool, dropped: Dict[str, int]) -> Tuple[pa.Schema, int]:
+    """Pickle a data type's records to a spool file in one cursor pass, inferring column types.
+
+    Returns the Arrow schema (columns in first-seen order) and the row count.
+    """
+    column_types = {}
+    rows = 0
+    batch = []
+    for record in iter_export_records(metadata, data_type, dropped):
+        for column, value in record.items():
+            value_type = type(value).__name__
+            if value_type == "int" and not -2 ** 63 <= value < 2 ** 63:
+                value_type = "bigint"
+            elif value_type == "int" and not -2 ** 53 <= value <= 2 ** 53:
+                value_type = "wideint"  # fits int64 but not exactly in a float64
+            column_types.setdefault(column, set()).add(value_type)
+        batch.append(record)
+        rows += 1
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+            batch = []
+    if batch:
+        pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    schema = pa.schema([(str(column), _arrow_type(types)) for column, types in column_types.items()])
+    return schema, rows
+
+def _iter_row_groups(spool, schema: pa.Schema) -> Iterator[pa.Table]:
+    """Replay a pickled spool as Arrow tables of up to PARQUET_ROW_GROUP_SIZE rows"""
+    records = []
+    
+    def table(rows: List[Dict]) -> pa.Table:
+        arrays = [
+            pa.array([_arrow_value(record.get(field.name), field.type) for record in rows], type=field.type)
+            for field in schema
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+    
+    while True:
+        try:
+            records.extend(pickle.load(spool))
+        except EOFError:
+            break
+        while len(records) >= PARQUET_ROW_GROUP_SIZE:
+            yield table(records[:PARQUET_ROW_GROUP_SIZE])
+            records = records[PARQUET_ROW_GROUP_SIZE:]
+    if records:
+        yield table(records)
+
+def stream_columnar_zip_export(metadata: Dict[str, Any]) -> Iterator[bytes]:
+    """Generate a ZIP with one Parquet or Arrow IPC file per data type, streamed as it is written.
+
+    Each data type is spooled in a single cursor pass that also infers typed
+    columns, then written row group by row group into its ZIP member. Member
+    SHA-512s and schemas are recorded in a manifest and in the export record.
+    """
+    export_format = metadata["format"]
+    sink = _StreamBuffer()
+    hasher = hashlib.sha512()
+    export_size = 0
+    members = {}
+    dropped = {}
+    
+    def drain() -> bytes:
+        nonlocal export_size
+        chunk = sink.drain()
+        hasher.update(chunk)
+        export_size += len(chunk)
+        return chunk
+    
+    # Parquet and Arrow files are compressed internally, so ZIP members are stored
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for data_type in metadata["data_types"]:
+            if data_type not in RECORD_COLLECTIONS:
+                continue
+            
+            with tempfile.TemporaryFile("w+b", dir=SCRATCH_DIR) as spool:
+                schema, rows = _spool_record_batches(metadata, data_type, spool, dropped)
+                if not rows:
+                    continue
+                spool.seek(0)
+                
+                member_name = f"{data_type}.{COLUMNAR_EXTENSIONS[export_format]}"
+                with archive.open(member_name, "w", force_zip64=True) as member:
+                    output = _HashingWriter(member)
+                    if export_format == "parquet":
+                        writer = pq.ParquetWriter(output, schema, compression=COLUMNAR_COMPRESSION)
+                    else:
+                        writer = pa.ipc.new_file(
+                            output, schema, options=pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+                        )
+                    for table in _iter_row_groups(spool, schema):
+                        writer.write_table(table)
+                        if sink.size >= EXPORT_CHUNK_SIZE:
+                            yield drain()
+                    writer.close()
+                
+                members[member_name] = {
+                    "data_type": data_type,
+                    "rows": rows,
+                    "file_hash": output.hasher.hexdigest(),
+                    "schema": [{"name": field.name, "type": str(field.type)} for field in schema]
+                }
+                yield drain()
+        
+        manifest = {"export_metadata": metadata, "members": members, "duplicates_dropped": dropped}
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    
+    yield drain()
+    
+    record_export(metadata, hasher.hexdigest(), export_size, members=members, duplicates_dropped=dropped)
+
+def instrument_export(stream: Iterator[bytes], export_format: str) -> Iterator[bytes]:
+    """Count the bytes and time of a streamed export"""
+    start = time.perf_counter()
+    for chunk in stream:
+        metrics.inc("export_bytes_total", len(chunk), format=export_format)
+        yield chunk
+    metrics.observe("stage_seconds", time.perf_counter() - start, stage=f"export_{export_format}")
+
+def export_artifact_key(case_id: str, data_types: List[str], export_format: str,
+                        deduplicate: bool, evidence_version: int) -> str:
+    """Key identifying an export whose content cannot change while the evidence doesn't"""
+    key = json.dumps([case_id, data_types, export_format, deduplicate, evidence_version])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def find_export_artifact(artifact_key: str, evidence_version: int) -> Optional[Dict[str, Any]]:
+    """Look up a stored export artifact that is still current and present on disk"""
+    artifact = export_artifacts_collection.find_one({"artifact_key": artifact_key})
+    if artifact and artifact["evidence_version"] == evidence_version and os.path.exists(artifact["path"]):
+        return artifact
+    return None
+
+def cache_export_artifact(stream: Iterator[bytes], metadata: Dict[str, Any], artifact_key: str) -> Iterator[bytes]:
+    """Tee a streamed export into the artifact store, publishing it once complete.
+
+    The artifact is only published for reuse if the case's evidence did not
+    change while the export was being produced; with RETAIN_EXPORTS the file is
+    kept for verification either way. Interrupted streams leave nothing behind.
+    """
+    os.makedirs(EXPORT_ARTIFACT_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".partial", dir=EXPORT_ARTIFACT_DIR)
+    try:
+        with os.fdopen(fd, "wb") as artifact:
+            for chunk in stream:
+                artifact.write(chunk)
+                yield chunk
+        
+        case = cases_collection.find_one({"case_id": metadata["case_id"]}, {"evidence_version": 1})
+        export = exports_collection.find_one({"export_id": metadata["export_id"]}, {"file_hash": 1, "file_size": 1})
+        current = case and case.get("evidence_version", 0) == metadata["evidence_version"]
+        if export and (current or RETAIN_EXPORTS):
+            path = os.path.join(EXPORT_ARTIFACT_DIR, f"{metadata['export_id']}.{EXPORT_FORMATS[metadata['format']][1]}")
+            os.replace(temp_path, path)
+            exports_collection.update_one({"export_id": metadata["export_id"]}, {"$set": {"stored_path": path}})
+        if export and current:
+            replaced = export_artifacts_collection.find_one_and_update(
+                {"artifact_key": artifact_key},
+                {"$set": {
+                    "artifact_key": artifact_key,
+                    "case_id": metadata["case_id"],
+                    "evidence_version": metadata["evidence_version"],
+                    "format": metadata["format"],
+                    "export_id": metadata["export_id"],
+                    "file_hash": export["file_hash"],
+                    "file_size": export["file_size"],
+                    "path": path,
+                    "created_at": create_evidence_timestamp()
+                }},
+                upsert=True
+            )
+            # A concurrent identical export may have been published first
+            if replaced and replaced["path"] != path:
+                remove_export_file(replaced["path"])
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def record_export(metadata: Dict[str, Any], file_hash: str, file_size: int, **extra) -> None:
+    """Store a completed export in the export history"""
+    exports_collection.insert_one({
+        "export_id": metadata["export_id"],
+        "case_id": metadata["case_id"],
+        "exported_at": metadata["exported_at"],
+        "format": metadata["format"],
+        "data_types": metadata["data_types"],
+        "deduplicate": metadata.get("deduplicate", False),
+        "file_size": file_size,
+        "file_hash": file_hash,
+        **extra
+    })
 
 # API Endpoints
+async def profile_request(request: Request, call_next):
+    """Run a request under cProfile when it carries an "X-Profile: 1" header"""
+    if request.headers.get("X-Profile") != "1" or not profile_lock.acquire(blocking=False):
+        return await call_next(request)
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+    finally:
+        profile_lock.release()
+    
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{int(time.time() * 1000)}_{request.method}_{re.sub(r'[^A-Za-z0-9]+', '_', request.url.path).strip('_')}.prof"
+    profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+    response.headers["X-Profile-File"] = name
+    return response
+
+# Only one profiler can be active at a time; the middleware costs nothing unless enabled
+profile_lock = threading.Lock()
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_request)
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Upload, ingest and export metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
@@ -178,224 +1983,838 @@ async def create_case(case: CaseCreate):
         "investigator": case.investigator,
         "description": case.description,
         "created_at": create_evidence_timestamp(),
-        "status": "active"
+        "status": "active",
+        "summary": {"messages_count": 0, "contacts_count": 0, "call_logs_count": 0},
+        "evidence_version": 0
     }
     
-    result = cases_collection.insert_one(case_data)
+    result = await run_db(cases_collection.insert_one, case_data)
     case_data["_id"] = str(result.inserted_id)
     
     return {"success": True, "case": case_data}
 
 @app.get("/api/cases")
-async def get_cases():
-    """Get all forensics cases"""
-    cases = list(cases_collection.find())
+async def get_cases(limit: Optional[int] = Query(None, ge=1, le=RECORDS_MAX_PAGE_SIZE),
+                    cursor: Optional[str] = None):
+    """Get forensics cases, optionally a page at a time (pass back next_cursor)"""
+    query = {}
+    if cursor:
+        try:
+            query["_id"] = {"$gt": ObjectId(cursor)}
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def find_cases():
+        found = cases_collection.find(query, CASE_LIST_PROJECTION).sort("_id", 1)
+        return list(found.limit(limit + 1) if limit else found)
+    
+    cases = await run_db(find_cases)
+    next_cursor = None
+    if limit and len(cases) > limit:
+        cases = cases[:limit]
+        next_cursor = str(cases[-1]["_id"])
     for case in cases:
         case["_id"] = str(case["_id"])
     
-    return {"cases": cases}
+    return {"cases": cases, "next_cursor": next_cursor}
+
+def delta_device_id(delta: bool, device_id: Optional[str], filename: str) -> Optional[str]:
+    """Device key of a delta upload, or None for a full ingest.
+
+    The caller must name the device: database file names such as msgstore.db
+    are shared by every phone, and marks from one device would skip rows of another.
+    """
+    if not delta:
+        return None
+    if filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Delta ingest only supports database files")
+    if not device_id or not device_id.strip():
+        raise HTTPException(status_code=400, detail="Delta ingest requires a device_id")
+    return device_id.strip()
 
 @app.post("/api/cases/{case_id}/upload")
-async def upload_evidence(case_id: str, file: UploadFile = File(...)):
-    """Upload evidence file for processing"""
+async def upload_evidence(case_id: str, file: UploadFile = File(...),
+                          delta: bool = Form(False), device_id: Optional[str] = Form(None)):
+    """Upload evidence file for processing.
+
+    With ``delta`` set, only rows added since the device's previous delta
+    upload to the case are stored; ``device_id`` must then name the device.
+    """
     
     # Verify case exists
-    case = cases_collection.find_one({"case_id": case_id})
+    case = await run_db(cases_collection.find_one, {"case_id": case_id})
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    # Read and hash file
-    file_content = await file.read()
-    file_hash = calculate_hash(file_content)
+    # Stream the upload into a per-request scratch directory, hashing as we go
+    filename = os.path.basename(file.filename or "") or "evidence.bin"
+    delta_device = delta_device_id(delta, device_id, filename)
+    scratch_dir = tempfile.mkdtemp(prefix="upload_", dir=SCRATCH_DIR)
+    temp_path = os.path.join(scratch_dir, filename)
     
-    # Save file temporarily for processing
-    temp_path = f"/tmp/{file.filename}"
-    with open(temp_path, "wb") as f:
-        f.write(file_content)
+    if not ingest_slots.acquire(blocking=False):
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail="Ingest queue is full, retry later")
     
-    # Parse data based on file type
-    parsed_data = {"messages": [], "contacts": [], "call_logs": []}
+    try:
+        file_size, file_hash = await spool_upload(file, temp_path)
+    except BaseException:
+        ingest_slots.release()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        raise
     
+    return await queue_evidence(
+        case_id, file.filename, temp_path, scratch_dir, file_size, file_hash, delta_device=delta_device
+    )
+
+async def queue_evidence(case_id: str, display_name: Optional[str], temp_path: str, scratch_dir: str,
+                         file_size: int, file_hash: str, delta_device: Optional[str] = None,
+                         **evidence_fields) -> Dict[str, Any]:
+    """Register spooled evidence and hand it to the ingest pool, or link an earlier parse.
+
+    The caller holds an ingest slot; it is released here on cache hits and
+    failures, and by the job's done callback otherwise. Delta uploads always
+    go to the pool, since their records depend on earlier acquisitions.
+    """
+    job_data = None
     try:
-        if file.filename.lower().endswith(('.db', '.sqlite', '.sqlite3')):
-            # Android/iOS SQLite database
-            parsed_data = parse_android_db(temp_path)
-        elif file.filename.lower().endswith('.zip'):
-            # iOS backup or Android backup archive
-            with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                extract_path = f"/tmp/extracted_{case_id}"
-                zip_ref.extractall(extract_path)
-                parsed_data = parse_ios_backup(extract_path)
-        else:
-            # Try to parse as SQLite database anyway
-            parsed_data = parse_android_db(temp_path)
+        # Store evidence in database; parsed data is attached by the ingest job
+        evidence_data = {
+            "evidence_id": str(uuid.uuid4()),
+            "case_id": case_id,
+            "filename": display_name,
+            "file_size": file_size,
+            "file_hash": file_hash,
+            "uploaded_at": create_evidence_timestamp(),
+            "processed": False,
+            **evidence_fields
+        }
+        evidence_data["records_evidence_id"] = evidence_data["evidence_id"]
+        if delta_device:
+            evidence_data.update({"delta": True, "device_id": delta_device})
+        job_data = {
+            "job_id": str(uuid.uuid4()),
+            "case_id": case_id,
+            "evidence_id": evidence_data["evidence_id"],
+            "status": JOB_QUEUED,
+            "rows_parsed": 0,
+            "created_at": create_evidence_timestamp()
+        }
+        evidence_data["job_id"] = job_data["job_id"]
+        
+        # Identical evidence was parsed before: link its records instead of re-parsing
+        cached = None
+        if not delta_device:
+            cached = await run_db(evidence_cache_collection.find_one, {"file_hash": file_hash})
+        if cached:
+            evidence_data["stored_path"] = await run_in_threadpool(retain_evidence_file, temp_path, file_hash)
+            await run_db(link_cached_evidence, evidence_data, job_data, cached)
+            metrics.inc("ingest_jobs_total", status="cached")
+            ingest_slots.release()
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return {
+                "success": True,
+                "job_id": job_data["job_id"],
+                "evidence_id": evidence_data["evidence_id"],
+                "file_hash": file_hash,
+                "status": JOB_DONE,
+                "cache_hit": True
+            }
+        
+        await run_db(evidence_collection.insert_one, evidence_data)
+        await run_db(jobs_collection.insert_one, job_data)
+        
+        # Hand parsing off to the process pool, retrying once on a fresh pool
+        # if an earlier worker death left the current one broken
+        job_args = (
+            run_ingest_job, job_data["job_id"], case_id, evidence_data["evidence_id"],
+            temp_path, os.path.basename(temp_path), file_hash, scratch_dir, delta_device
+        )
+        executor = ingest_executor
+        try:
+            future = executor.submit(*job_args)
+        except BrokenProcessPool:
+            executor = replace_ingest_executor(executor)
+            future = executor.submit(*job_args)
     
-    except Exception as e:
-        print(f"Error parsing file: {e}")
+    except BaseException as e:
+        ingest_slots.release()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        if job_data:
+            await run_db(mark_ingest_failed, job_data["job_id"], str(e))
+        raise
     
-    # Store evidence in database
-    evidence_data = {
-        "evidence_id": str(uuid.uuid4()),
-        "case_id": case_id,
-        "filename": file.filename,
-        "file_size": len(file_content),
+    future.add_done_callback(
+        lambda f: _on_ingest_job_finished(job_data["job_id"], scratch_dir, executor, f)
+    )
+    
+    return {
+        "success": True,
+        "job_id": job_data["job_id"],
+        "evidence_id": evidence_data["evidence_id"],
         "file_hash": file_hash,
-        "uploaded_at": create_evidence_timestamp(),
-        "data": parsed_data,
-        "processed": True
+        "status": JOB_QUEUED
     }
+
+def upload_session_status(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of an upload session, including the chunks still missing"""
+    received = session.get("chunks", {})
+    return {
+        "upload_id": session["upload_id"],
+        "case_id": session["case_id"],
+        "filename": session["filename"],
+        "file_size": session["file_size"],
+        "chunk_size": session["chunk_size"],
+        "total_chunks": session["total_chunks"],
+        "received_chunks": len(received),
+        "missing_chunks": [index for index in range(session["total_chunks"]) if str(index) not in received],
+        "status": session["status"],
+        "evidence_id": session.get("evidence_id"),
+        "job_id": session.get("job_id")
+    }
+
+@app.post("/api/cases/{case_id}/uploads")
+async def create_upload_session(case_id: str, upload: UploadSessionCreate):
+    """Start a resumable upload; chunks may then be sent in any order, in parallel"""
+    case = await run_db(cases_collection.find_one, {"case_id": case_id}, {"_id": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
     
-    evidence_collection.insert_one(evidence_data)
+    chunk_size = upload.chunk_size or UPLOAD_SESSION_CHUNK_SIZE
+    if upload.file_size <= 0 or not 0 < chunk_size <= UPLOAD_MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail="Invalid file or chunk size")
     
-    # Clean up temp files
-    try:
-        os.remove(temp_path)
-        if file.filename.lower().endswith('.zip'):
-            import shutil
-            shutil.rmtree(f"/tmp/extracted_{case_id}", ignore_errors=True)
-    except:
-        pass
+    filename = os.path.basename(upload.filename) or "evidence.bin"
+    delta_device = delta_device_id(upload.delta, upload.device_id, filename)
+    scratch_dir = tempfile.mkdtemp(prefix="upload_", dir=SCRATCH_DIR)
+    path = os.path.join(scratch_dir, filename)
+    with open(path, "wb") as f:
+        f.truncate(upload.file_size)
     
-    # Return summary
-    summary = {
-        "messages_count": len(parsed_data["messages"]),
-        "contacts_count": len(parsed_data["contacts"]),
-        "call_logs_count": len(parsed_data["call_logs"])
+    session = {
+        "upload_id": str(uuid.uuid4()),
+        "case_id": case_id,
+        "filename": upload.filename,
+        "file_size": upload.file_size,
+        "chunk_size": chunk_size,
+        "total_chunks": -(-upload.file_size // chunk_size),
+        "path": path,
+        "scratch_dir": scratch_dir,
+        "chunks": {},
+        "delta_device": delta_device,
+        "status": UPLOAD_OPEN,
+        "created_at": create_evidence_timestamp()
     }
+    await run_db(upload_sessions_collection.insert_one, session)
+    return {"success": True, **upload_session_status(session)}
+
+@app.put("/api/uploads/{upload_id}/chunks/{index}")
+async def put_upload_chunk(upload_id: str, index: int, request: Request):
+    """Store one chunk of a resumable upload (re-sending a chunk replaces it).
+
+    An optional X-Chunk-SHA256 header is checked against the received bytes.
+    """
+    session = await run_db(upload_sessions_collection.find_one, {"upload_id": upload_id})
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if session["status"] != UPLOAD_OPEN:
+        raise HTTPException(status_code=409, detail="Upload is already finalized")
+    if not 0 <= index < session["total_chunks"]:
+        raise HTTPException(status_code=400, detail="Chunk index out of range")
     
-    return {
-        "success": True,
-        "evidence_id": evidence_data["evidence_id"],
-        "file_hash": file_hash,
-        "summary": summary
-    }
+    offset = index * session["chunk_size"]
+    expected_size = min(session["chunk_size"], session["file_size"] - offset)
+    data = await request.body()
+    if len(data) != expected_size:
+        raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected_size} bytes")
+    
+    chunk_hash = await run_in_threadpool(lambda: hashlib.sha256(data).hexdigest())
+    if request.headers.get("X-Chunk-SHA256", chunk_hash).lower() != chunk_hash:
+        raise HTTPException(status_code=400, detail="Chunk hash mismatch")
+    
+    try:
+        await run_in_threadpool(write_chunk, session["path"], offset, data)
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="Upload is already finalized")
+    # A finalize may have claimed the session meanwhile; it re-checks every chunk on disk
+    stored = await run_db(
+        upload_sessions_collection.update_one,
+        {"upload_id": upload_id, "status": UPLOAD_OPEN},
+        {"$set": {f"chunks.{index}": chunk_hash}}
+    )
+    if not stored.matched_count:
+        raise HTTPException(status_code=409, detail="Upload is already finalized")
+    metrics.inc("upload_bytes_total", len(data))
+    metrics.inc("hashed_bytes_total", len(data), stage="upload_chunk")
+    
+    return {"success": True, "upload_id": upload_id, "index": index, "sha256": chunk_hash}
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload_session(upload_id: str):
+    """Get the progress of a resumable upload, including which chunks are missing"""
+    session = await run_db(upload_sessions_collection.find_one, {"upload_id": upload_id})
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload_session_status(session)
+
+@app.post("/api/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str):
+    """Verify a complete resumable upload and hand it to the regular ingest path"""
+    session = await run_db(upload_sessions_collection.find_one, {"upload_id": upload_id})
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    status = upload_session_status(session)
+    if status["missing_chunks"]:
+        raise HTTPException(status_code=409, detail=f"{len(status['missing_chunks'])} chunks are still missing")
+    
+    # Only one finalize may proceed; chunk writes are refused from here on, and
+    # the chunk hashes are taken from the claimed session
+    session = await run_db(
+        upload_sessions_collection.find_one_and_update,
+        {"upload_id": upload_id, "status": UPLOAD_OPEN},
+        {"$set": {"status": UPLOAD_FINALIZING}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not session:
+        raise HTTPException(status_code=409, detail="Upload is already finalized")
+    
+    if not ingest_slots.acquire(blocking=False):
+        await run_db(upload_sessions_collection.update_one, {"upload_id": upload_id}, {"$set": {"status": UPLOAD_OPEN}})
+        raise HTTPException(status_code=503, detail="Ingest queue is full, retry later")
+    
+    sealed_path = None
+    try:
+        # Re-hash the file as stored: the Merkle root, the SHA-512 and the bytes
+        # handed to ingest must all describe the same data. Sealing it first
+        # keeps chunk writes that raced the claim from landing after the hash.
+        sealed_path = await run_in_threadpool(seal_upload_file, session["path"])
+        recorded = [session["chunks"].get(str(index)) for index in range(session["total_chunks"])]
+        with metrics.time("stage_seconds", stage="upload_hash"):
+            file_hash, on_disk = await run_in_threadpool(
+                hash_upload_chunks, sealed_path, session["chunk_size"], session["total_chunks"]
+            )
+        metrics.inc("hashed_bytes_total", session["file_size"], stage="upload")
+        mismatched = [index for index, (expected, actual) in enumerate(zip(recorded, on_disk)) if expected != actual]
+    except BaseException:
+        ingest_slots.release()
+        if sealed_path:
+            await run_in_threadpool(os.rename, sealed_path, session["path"])
+        await run_db(upload_sessions_collection.update_one, {"upload_id": upload_id}, {"$set": {"status": UPLOAD_OPEN}})
+        raise
+    
+    if mismatched:
+        # Reopen the upload with the inconsistent chunks marked missing so they can be re-sent
+        ingest_slots.release()
+        await run_in_threadpool(os.rename, sealed_path, session["path"])
+        await run_db(
+            upload_sessions_collection.update_one,
+            {"upload_id": upload_id},
+            {"$set": {"status": UPLOAD_OPEN}, "$unset": {f"chunks.{index}": "" for index in mismatched}}
+        )
+        raise HTTPException(status_code=409, detail=f"Chunks {mismatched} do not match their recorded hashes; re-send them")
+    root = merkle_root(recorded)
+    
+    try:
+        result = await queue_evidence(
+            session["case_id"], session["filename"], sealed_path, session["scratch_dir"],
+            session["file_size"], file_hash, delta_device=session.get("delta_device"),
+            merkle_root=root, chunk_size=session["chunk_size"], upload_id=upload_id
+        )
+    except BaseException as e:
+        # The scratch file is gone with the failed hand-off, so the upload cannot be retried
+        await run_db(
+            upload_sessions_collection.update_one,
+            {"upload_id": upload_id},
+            {"$set": {"status": UPLOAD_FAILED, "error": str(e)}}
+        )
+        raise
+    await run_db(
+        upload_sessions_collection.update_one,
+        {"upload_id": upload_id},
+        {"$set": {
+            "status": UPLOAD_FINALIZED,
+            "merkle_root": root,
+            "file_hash": file_hash,
+            "evidence_id": result["evidence_id"],
+            "job_id": result["job_id"],
+            "finalized_at": create_evidence_timestamp()
+        }}
+    )
+    return {**result, "merkle_root": root}
+
+@app.delete("/api/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    """Abandon an unfinished resumable upload and free its scratch space"""
+    session = await run_db(
+        upload_sessions_collection.find_one_and_delete, {"upload_id": upload_id, "status": UPLOAD_OPEN}
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="No open upload with that id")
+    shutil.rmtree(session["scratch_dir"], ignore_errors=True)
+    return {"success": True, "upload_id": upload_id}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a background ingest or verification job"""
+    job = await run_db(jobs_collection.find_one, {"job_id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    job["_id"] = str(job["_id"])
+    return {"job": job}
 
 @app.get("/api/cases/{case_id}/evidence")
 async def get_case_evidence(case_id: str):
     """Get all evidence for a case"""
-    evidence_list = list(evidence_collection.find({"case_id": case_id}))
+    # Record counts are stored at ingest; never pull legacy embedded data
+    evidence_list = await run_db(
+        lambda: list(evidence_collection.find({"case_id": case_id}, EVIDENCE_LIST_PROJECTION).sort("uploaded_at", 1))
+    )
     
     for evidence in evidence_list:
         evidence["_id"] = str(evidence["_id"])
-        # Don't include raw data in list view
-        if "data" in evidence:
-            summary = {
-                "messages_count": len(evidence["data"].get("messages", [])),
-                "contacts_count": len(evidence["data"].get("contacts", [])),
-                "call_logs_count": len(evidence["data"].get("call_logs", []))
-            }
-            evidence["summary"] = summary
-            del evidence["data"]
     
     return {"evidence": evidence_list}
 
+def search_case_messages(case_id: str, query: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+    """Run a ranked text search over a case's messages.
+
+    The text index is prefixed by evidence_id, so each evidence source is searched
+    separately for its best skip+limit hits and the results are merged by score.
+    """
+    hits = []
+    for source in case_record_sources(case_id):
+        cursor = messages_collection.find(
+            {"evidence_id": source, "$text": {"$search": query}},
+            {"_id": 0, "evidence_id": 1, "record": 1, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(skip + limit)
+        hits.extend(cursor)
+    
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    return hits[skip:skip + limit]
+
+@app.get("/api/cases/{case_id}/search")
+async def search_messages(case_id: str,
+                          q: str = Query(..., min_length=1),
+                          page: int = Query(1, ge=1),
+                          page_size: int = Query(50, ge=1, le=SEARCH_MAX_PAGE_SIZE)):
+    """Full-text search over the messages of a case, ranked by relevance"""
+    case = await run_db(cases_collection.find_one, {"case_id": case_id}, {"_id": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    
+    # Fetch one extra hit to know whether another page exists
+    hits = await run_db(search_case_messages, case_id, q, (page - 1) * page_size, page_size + 1)
+    
+    return {
+        "query": q,
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(hits) > page_size,
+        "hits": hits[:page_size]
+    }
+
+@app.post("/api/cases/{case_id}/verify")
+async def verify_case(case_id: str):
+    """Start re-hashing a case's stored evidence and export artifacts.
+
+    Each item is reported as pass, fail or missing in the job, with its
+    SHA-512, SHA-256 and MD5; poll /api/jobs/{job_id} for the report.
+    """
+    case = await run_db(cases_collection.find_one, {"case_id": case_id}, {"_id": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    
+    items = await run_db(verification_items, case_id)
+    job_data = {
+        "job_id": str(uuid.uuid4()),
+        "type": "verify",
+        "case_id": case_id,
+        "status": JOB_QUEUED,
+        "items_total": len(items),
+        "items_verified": 0,
+        "bytes_verified": 0,
+        "created_at": create_evidence_timestamp()
+    }
+    await run_db(jobs_collection.insert_one, job_data)
+    
+    task = asyncio.create_task(run_verify_job(job_data["job_id"], items))
+    verify_tasks.add(task)
+    task.add_done_callback(verify_tasks.discard)
+    
+    return {"success": True, "job_id": job_data["job_id"], "status": JOB_QUEUED, "items": len(items)}
+
+@app.get("/api/cases/{case_id}/timeline")
+async def get_case_timeline(case_id: str,
+                            top: int = Query(20, ge=1, le=RECORDS_MAX_PAGE_SIZE),
+                            sort_by: str = Query("call_duration", pattern="^(messages|calls|call_duration)$")):
+    """Per-day record counts and top counterparties, read from the ingest rollups"""
+    case = await run_db(cases_collection.find_one, {"case_id": case_id}, {"_id": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    
+    sources = {"$in": await run_db(case_record_sources, case_id)}
+    
+    day_counts = await run_db(lambda: list(rollups_collection.aggregate([
+        {"$match": {"evidence_id": sources, "kind": "day"}},
+        {"$group": {"_id": {"day": "$key", "data_type": "$data_type"}, "count": {"$sum": "$count"}}}
+    ])))
+    days = {}
+    for row in day_counts:
+        day = days.setdefault(row["_id"]["day"], {"day": row["_id"]["day"], **{data_type: 0 for data_type in RECORD_COLLECTIONS}})
+        day[row["_id"]["data_type"]] += row["count"]
+    
+    counterparties = await run_db(lambda: list(rollups_collection.aggregate([
+        {"$match": {"evidence_id": sources, "kind": "counterparty"}},
+        {"$group": {
+            "_id": "$key",
+            "messages": {"$sum": "$messages"},
+            "calls": {"$sum": "$calls"},
+            "call_duration": {"$sum": "$call_duration"}
+        }},
+        {"$sort": {sort_by: -1, "_id": 1}},
+        {"$limit": top}
+    ])))
+    
+    return {
+        "case_id": case_id,
+        "days": [days[day] for day in sorted(days)],
+        "top_counterparties": [
+            {"phone": row.pop("_id"), **row} for row in counterparties
+        ]
+    }
+
+def encode_records_cursor(doc: Dict[str, Any]) -> str:
+    """Encode the (timestamp, _id) position of a record as an opaque page cursor"""
+    position = json.dumps([doc["timestamp"], str(doc["_id"])])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_records_cursor(cursor: str) -> Tuple[int, ObjectId]:
+    """Decode a page cursor back into its (timestamp, _id) position"""
+    try:
+        timestamp, object_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(timestamp), ObjectId(object_id)
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/api/cases/{case_id}/records/{data_type}")
+async def browse_records(case_id: str, data_type: str,
+                         cursor: Optional[str] = None,
+                         limit: int = Query(100, ge=1, le=RECORDS_MAX_PAGE_SIZE),
+                         since: Optional[int] = Query(None, description="Earliest timestamp (epoch ms)"),
+                         until: Optional[int] = Query(None, description="Latest timestamp (epoch ms)"),
+                         phone: Optional[str] = None,
+                         table: Optional[str] = None):
+    """Page through a case's records with keyset (cursor) pagination and server-side filters"""
+    if data_type not in RECORD_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown data type")
+    
+    case = await run_db(cases_collection.find_one, {"case_id": case_id}, {"_id": 1})
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+    
+    query = {"evidence_id": {"$in": await run_db(case_record_sources, case_id)}}
+    if phone:
+        query["phone"] = normalize_phone(phone)
+    if table:
+        query["table"] = table
+    if since is not None or until is not None:
+        query["timestamp"] = {}
+        if since is not None:
+            query["timestamp"]["$gte"] = since
+        if until is not None:
+            query["timestamp"]["$lte"] = until
+    
+    # Resume strictly after the last record of the previous page
+    if cursor:
+        timestamp, object_id = decode_records_cursor(cursor)
+        query["$or"] = [
+            {"timestamp": {"$gt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$gt": object_id}}
+        ]
+    
+    docs = await run_db(lambda: list(
+        RECORD_COLLECTIONS[data_type].find(
+            query, {"_id": 1, "evidence_id": 1, "timestamp": 1, "record": 1}
+        ).sort([("timestamp", 1), ("_id", 1)]).limit(limit + 1)
+    ))
+    
+    next_cursor = encode_records_cursor(docs[limit - 1]) if len(docs) > limit else None
+    records = [
+        {"evidence_id": doc["evidence_id"], "timestamp": doc["timestamp"], "record": doc["record"]}
+        for doc in docs[:limit]
+    ]
+    
+    return {"records": records, "next_cursor": next_cursor}
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single "bytes=" Range header into inclusive offsets.
+
+    Returns None for headers that should be ignored (malformed or multi-range),
+    and raises 416 for ranges outside the content.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the final N bytes
+        start, end = max(0, size - int(last)), size - 1
+        if int(last) == 0:
+            start = size
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    
+    if start >= size or end < start:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+def iter_file_range(path: str, start: int, length: int) -> Iterator[bytes]:
+    """Stream part of a file in EXPORT_CHUNK_SIZE pieces"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(EXPORT_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@app.get("/api/blobs/{sha256}")
+async def get_blob(sha256: str, request: Request):
+    """Fetch an offloaded binary value, honouring single HTTP byte ranges"""
+    if not re.fullmatch(r"[0-9a-f]{64}", sha256) or not os.path.exists(blob_path(sha256)):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    
+    path = blob_path(sha256)
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{sha256}"'}
+    
+    byte_range = parse_byte_range(request.headers["Range"], size) if "Range" in request.headers else None
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file_range(path, 0, size), media_type="application/octet-stream", headers=headers)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(path, start, end - start + 1),
+        status_code=206,
+        media_type="application/octet-stream",
+        headers=headers
+    )
+
+@app.get("/api/evidence/{evidence_id}/members")
+async def get_evidence_members(evidence_id: str):
+    """Get the per-member hashes recorded for an evidence archive"""
+    evidence = await run_db(evidence_collection.find_one, {"evidence_id": evidence_id}, {"records_evidence_id": 1})
+    if not evidence:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+    
+    records_evidence_id = evidence.get("records_evidence_id", evidence_id)
+    members = await run_db(
+        lambda: list(evidence_members_collection.find(
+            {"evidence_id": records_evidence_id}, {"_id": 0, "case_id": 0, "evidence_id": 0}
+        ).sort("name", 1))
+    )
+    return {"members": members}
+
+@app.delete("/api/cases/{case_id}/evidence/{evidence_id}")
+async def delete_evidence(case_id: str, evidence_id: str):
+    """Remove an evidence item; its parsed records are dropped once no case references them"""
+    evidence = await run_db(evidence_collection.find_one, {"case_id": case_id, "evidence_id": evidence_id})
+    if not evidence:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+    if not evidence.get("processed") and evidence.get("status") != JOB_FAILED:
+        raise HTTPException(status_code=409, detail="Evidence is still being processed")
+    if await run_db(delta_dependents, evidence):
+        raise HTTPException(
+            status_code=409,
+            detail="Later delta acquisitions of this device build on this evidence; delete them first"
+        )
+    
+    def remove() -> bool:
+        evidence_collection.delete_one({"evidence_id": evidence_id})
+        records_evidence_id = evidence.get("records_evidence_id", evidence_id)
+        summary = {} if case_uses_records(case_id, records_evidence_id) else evidence.get("summary", {})
+        record_evidence_change(case_id, {key: -count for key, count in summary.items()})
+        release_evidence_file(evidence.get("file_hash"))
+        restore_ingest_watermarks(evidence)
+        return collect_unreferenced_records(records_evidence_id)
+    
+    records_removed = await run_db(remove)
+    return {"success": True, "evidence_id": evidence_id, "records_removed": records_removed}
+
 @app.post("/api/export")
 async def export_data(request: ExportRequest):
     """Export forensics data in specified format"""
     
-    # Get all evidence for the case
-    evidence_list = list(evidence_collection.find({"case_id": request.case_id}))
-    if not evidence_list:
+    # Make sure the case has evidence
+    if not await run_db(evidence_collection.find_one, {"case_id": request.case_id}, {"_id": 1}):
         raise HTTPException(status_code=404, detail="No evidence found for case")
     
-    # Aggregate data
-    aggregated_data = {"messages": [], "contacts": [], "call_logs": []}
+    export_format = request.export_format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid export format or no data to export")
+    media_type, extension = EXPORT_FORMATS[export_format]
     
-    for evidence in evidence_list:
-        for data_type in request.data_types:
-            if data_type in evidence.get("data", {}):
-                aggregated_data[data_type].extend(evidence["data"][data_type])
+    # Serve an identical earlier export straight from the artifact store while
+    # the case's evidence is unchanged
+    case = await run_db(cases_collection.find_one, {"case_id": request.case_id}, {"evidence_version": 1})
+    evidence_version = case.get("evidence_version", 0) if case else 0
+    artifact_key = export_artifact_key(
+        request.case_id, request.data_types, export_format, request.deduplicate, evidence_version
+    )
+    artifact = await run_db(find_export_artifact, artifact_key, evidence_version)
+    if artifact:
+        await run_db(
+            exports_collection.update_one,
+            {"export_id": artifact["export_id"]},
+            {"$inc": {"served_count": 1}, "$set": {"last_served_at": create_evidence_timestamp()}}
+        )
+        metrics.inc("export_cache_total", result="hit")
+        metrics.inc("export_bytes_total", artifact["file_size"], format=export_format)
+        return FileResponse(
+            artifact["path"],
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename=forensics_export_{artifact['export_id']}.{extension}",
+                "X-Export-Id": artifact["export_id"],
+                "X-Export-Hash": artifact["file_hash"]
+            }
+        )
+    metrics.inc("export_cache_total", result="miss")
     
     # Create export record
     export_id = str(uuid.uuid4())
-    export_timestamp = create_evidence_timestamp()
+    metadata = {
+        "export_id": export_id,
+        "case_id": request.case_id,
+        "exported_at": create_evidence_timestamp(),
+        "data_types": request.data_types,
+        "format": export_format,
+        "deduplicate": request.deduplicate,
+        "evidence_version": evidence_version
+    }
     
     # Generate export based on format
-    if request.export_format.lower() == "json":
-        # JSON export
-        export_data = {
-            "export_metadata": {
-                "export_id": export_id,
-                "case_id": request.case_id,
-                "exported_at": export_timestamp,
-                "data_types": request.data_types,
-                "format": "json"
-            },
-            "data": aggregated_data
-        }
-        
-        json_content = json.dumps(export_data, indent=2, default=str)
-        export_hash = calculate_hash(json_content.encode())
-        
-        # Store export record
-        exports_collection.insert_one({
-            "export_id": export_id,
-            "case_id": request.case_id,
-            "exported_at": export_timestamp,
-            "format": "json",
-            "data_types": request.data_types,
-            "file_hash": export_hash
-        })
-        
-        # Return as streaming response
-        return StreamingResponse(
-            io.StringIO(json_content),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f"attachment; filename=forensics_export_{export_id}.json",
-                "X-Export-Hash": export_hash
-            }
-        )
+    if export_format == "json":
+        # JSON export, streamed from the database cursor; the SHA-512 is only
+        # known once streaming completes and is recorded in the export history
+        stream = stream_json_export(metadata)
     
-    elif request.export_format.lower() == "csv":
-        # CSV export - create separate files for each data type
-        csv_files = {}
-        
-        for data_type in request.data_types:
-            if aggregated_data[data_type]:
-                # Convert to DataFrame
-                df = pd.DataFrame(aggregated_data[data_type])
-                csv_content = df.to_csv(index=False)
-                csv_files[data_type] = csv_content
+    elif export_format == "ndjson":
+        # NDJSON export - one record per line, consumable incrementally
+        stream = stream_ndjson_export(metadata)
+    
+    else:
+        # ZIP exports hold one file per data type and need at least one record
+        sources = await run_db(case_record_sources, request.case_id)
+        has_records = await run_db(lambda: any(
+            RECORD_COLLECTIONS[data_type].find_one({"evidence_id": {"$in": sources}}, {"_id": 1})
+            for data_type in request.data_types if data_type in RECORD_COLLECTIONS
+        ))
+        if not has_records:
+            raise HTTPException(status_code=400, detail="Invalid export format or no data to export")
         
-        # For CSV, we'll return the first available data type
-        # In a real implementation, you might want to create a ZIP file
-        if csv_files:
-            first_type = list(csv_files.keys())[0]
-            csv_content = csv_files[first_type]
-            export_hash = calculate_hash(csv_content.encode())
-            
-            # Store export record
-            exports_collection.insert_one({
-                "export_id": export_id,
-                "case_id": request.case_id,
-                "exported_at": export_timestamp,
-                "format": "csv",
-                "data_types": request.data_types,
-                "file_hash": export_hash
-            })
-            
-            return StreamingResponse(
-                io.StringIO(csv_content),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=forensics_export_{first_type}_{export_id}.csv",
-                    "X-Export-Hash": export_hash
-                }
-            )
+        if export_format == "csv":
+            # CSV export - one CSV per data type, streamed inside a ZIP archive
+            stream = stream_csv_zip_export(metadata)
+        else:
+            # Parquet / Arrow IPC export - one typed, compressed file per data type
+            stream = stream_columnar_zip_export(metadata)
     
-    raise HTTPException(status_code=400, detail="Invalid export format or no data to export")
+    return StreamingResponse(
+        instrument_export(cache_export_artifact(stream, metadata, artifact_key), export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=forensics_export_{export_id}.{extension}",
+            "X-Export-Id": export_id
+        }
+    )
 
 @app.get("/api/exports/{case_id}")
 async def get_exports(case_id: str):
     """Get export history for a case"""
-    exports = list(exports_collection.find({"case_id": case_id}))
+    exports = await run_db(lambda: list(exports_collection.find({"case_id": case_id}).sort("exported_at", 1)))
     
     for export in exports:
         export["_id"] = str(export["_id"])
     
     return {"exports": exports}
 
+def hot_queries(case_id: str, evidence_ids: List[str]) -> List[Tuple[str, Any, Dict, Optional[List]]]:
+    """The (name, collection, filter, sort) of each query the API serves most often"""
+    sources = {"$in": evidence_ids}
+    return [
+        ("case_by_id", cases_collection, {"case_id": case_id}, None),
+        ("case_evidence", evidence_collection, {"case_id": case_id}, [("uploaded_at", 1)]),
+        ("case_record_sources", evidence_collection, {"case_id": case_id, "processed": True}, None),
+        ("evidence_by_hash", evidence_collection, {"file_hash": ""}, None),
+        ("case_exports", exports_collection, {"case_id": case_id}, [("exported_at", 1)]),
+        ("job_by_id", jobs_collection, {"job_id": ""}, None),
+        ("export_messages", messages_collection, {"evidence_id": sources}, None),
+        ("browse_messages", messages_collection, {"evidence_id": sources}, [("timestamp", 1), ("_id", 1)]),
+        ("evidence_members", evidence_members_collection, {"evidence_id": ""}, [("name", 1)])
+    ]
+
+def plan_stages(plan: Dict) -> List[Dict]:
+    """Flatten an explain plan tree into its stages, root first"""
+    # Slot-based engine plans nest the classic tree under "queryPlan"
+    plan = plan.get("queryPlan", plan)
+    stages = [plan]
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"]] + children
+    for child in children:
+        stages.extend(plan_stages(child))
+    return stages
+
+def explain_query(collection, query: Dict, sort: Optional[List]) -> Dict[str, Any]:
+    """Run explain on a query and summarize the winning plan and its execution stats"""
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    explain = cursor.explain()
+    
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    stats = explain.get("executionStats", {})
+    return {
+        "collection": collection.name,
+        "stages": [stage["stage"] for stage in stages],
+        "indexes": [stage["indexName"] for stage in stages if "indexName" in stage],
+        "collscan": any(stage["stage"] == "COLLSCAN" for stage in stages),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis")
+    }
+
+@app.get("/api/diagnostics/query-plans")
+async def get_query_plans(case_id: Optional[str] = None):
+    """Report explain-plan stats for the hot queries so regressions to COLLSCAN are visible"""
+    if case_id is None:
+        case = await run_db(cases_collection.find_one, {}, {"case_id": 1})
+        case_id = case["case_id"] if case else ""
+    evidence_ids = await run_db(case_record_sources, case_id)
+    
+    plans = {}
+    for name, collection, query, sort in hot_queries(case_id, evidence_ids):
+        try:
+            plans[name] = await run_db(explain_query, collection, query, sort)
+        except Exception as e:
+            plans[name] = {"collection": collection.name, "error": str(e)}
+    
+    return {
+        "case_id": case_id,
+        "collscans": [name for name, plan in plans.items() if plan.get("collscan")],
+        "plans": plans
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
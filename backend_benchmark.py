@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Ingest/export benchmark for the CyberForensics Data Extraction Tool backend.
+
+Generates synthetic Android and iOS-style device databases and backup ZIPs,
+then drives them through upload -> parse/store -> browse -> export -> cleanup
+against the FastAPI app in-process, reporting throughput, latency percentiles
+and peak RSS (this process plus ingest workers) per stage.
+
+Usage:
+    python backend_benchmark.py --scales 10k,100k --repeat 3 --output bench.json
+    python backend_benchmark.py --compare baseline.json bench.json --threshold 10
+
+Records are stored in the database named by MONGO_URL (default: a separate
+cyberforensics_benchmark database on localhost). Pass --mongomock to run
+without a MongoDB server; ingest then runs on threads instead of processes.
+mongomock has no real indexes, so its database-bound timings are only useful
+for comparing runs made the same way.
+"""
+
+import os
+import sys
+import time
+import json
+import math
+import uuid
+import shutil
+import sqlite3
+import zipfile
+import plistlib
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+DEFAULT_MONGO_URL = 'mongodb://localhost:27017/cyberforensics_benchmark'
+SOURCES = ["android_db", "ios_db", "android_backup", "ios_backup"]
+STAGES = ["upload", "ingest", "browse", "export_json", "export_csv", "cleanup"]
+ANDROID_EPOCH_MS = 1625097600000
+APPLE_EPOCH_OFFSET = 978307200  # seconds between 1970-01-01 and 2001-01-01
+GENERATE_CHUNK = 100000
+
+def parse_scale(value):
+    """Parse a row count such as 10000, 100k or 10M"""
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+def split_rows(rows):
+    """Split a total row count across messages, call logs and contacts"""
+    messages = rows * 6 // 10
+    calls = rows * 3 // 10
+    return messages, calls, rows - messages - calls
+
+def insert_rows(conn, sql, rows):
+    """Insert generated rows in chunks so generation memory stays flat"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= GENERATE_CHUNK:
+            conn.executemany(sql, chunk)
+            chunk = []
+    if chunk:
+        conn.executemany(sql, chunk)
+    conn.commit()
+
+def phone_number(i):
+    """Synthetic counterparty number; a few thousand distinct numbers"""
+    return f"+1555{i % 5000:07d}"
+
+def create_android_db(path, rows):
+    """Create an Android-style database with sms, calls and contacts tables"""
+    messages, calls, contacts = split_rows(rows)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sms (_id INTEGER PRIMARY KEY, address TEXT, body TEXT, date INTEGER, type INTEGER)")
+    conn.execute("CREATE TABLE calls (_id INTEGER PRIMARY KEY, number TEXT, date INTEGER, duration INTEGER, type INTEGER)")
+    conn.execute("CREATE TABLE contacts (_id INTEGER PRIMARY KEY, name TEXT, phone TEXT, email TEXT)")
+    insert_rows(conn, "INSERT INTO sms (address, body, date, type) VALUES (?, ?, ?, ?)", (
+        (phone_number(i), f"Synthetic message {i} about the meeting", ANDROID_EPOCH_MS + i * 60000, 1 + i % 2)
+        for i in range(messages)
+    ))
+    insert_rows(conn, "INSERT INTO calls (number, date, duration, type) VALUES (?, ?, ?, ?)", (
+        (phone_number(i), ANDROID_EPOCH_MS + i * 90000, i % 600, 1 + i % 3)
+        for i in range(calls)
+    ))
+    insert_rows(conn, "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)", (
+        (f"Contact {i}", phone_number(i), f"contact{i}@example.com")
+        for i in range(contacts)
+    ))
+    conn.close()
+
+def create_ios_db(path, rows):
+    """Create an iOS-style database with message, call_history and contact tables"""
+    messages, calls, contacts = split_rows(rows)
+    apple_seconds = ANDROID_EPOCH_MS // 1000 - APPLE_EPOCH_OFFSET
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE message (ROWID INTEGER PRIMARY KEY, text TEXT, phone TEXT, date INTEGER, is_from_me INTEGER)")
+    conn.execute("CREATE TABLE call_history (ROWID INTEGER PRIMARY KEY, number TEXT, date INTEGER, duration REAL, originated INTEGER)")
+    conn.execute("CREATE TABLE contact (ROWID INTEGER PRIMARY KEY, display_name TEXT, phone TEXT)")
+    # iOS dates count seconds from 2001-01-01 and are stored as-is
+    insert_rows(conn, "INSERT INTO message (text, phone, date, is_from_me) VALUES (?, ?, ?, ?)", (
+        (f"Synthetic iMessage {i} about the meeting", phone_number(i), apple_seconds + i * 60, i % 2)
+        for i in range(messages)
+    ))
+    insert_rows(conn, "INSERT INTO call_history (number, date, duration, originated) VALUES (?, ?, ?, ?)", (
+        (phone_number(i), apple_seconds + i * 90, float(i % 600), i % 2)
+        for i in range(calls)
+    ))
+    insert_rows(conn, "INSERT INTO contact (display_name, phone) VALUES (?, ?)", (
+        (f"Contact {i}", phone_number(i)) for i in range(contacts)
+    ))
+    conn.close()
+
+def create_android_backup(path, rows, scratch):
+    """Android backup ZIP: the telephony databases under their app paths"""
+    db_path = os.path.join(scratch, "mmssms.db")
+    create_android_db(db_path, rows)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(db_path, "apps/com.android.providers.telephony/db/mmssms.db")
+        archive.writestr("apps/com.android.providers.telephony/_manifest", "com.android.providers.telephony\n")
+    os.remove(db_path)
+
+def create_ios_backup(path, rows, scratch):
+    """iOS backup ZIP: hash-named SQLite members (found by header) plus plists"""
+    db_path = os.path.join(scratch, "sms.db")
+    create_ios_db(db_path, rows)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(db_path, "3d/3d0d7e5fb2ce288813306e4d4636395e047a3d28")
+        archive.writestr("Manifest.plist", plistlib.dumps({"IsEncrypted": False, "Version": "10.0"}))
+        archive.writestr("Info.plist", plistlib.dumps({"Device Name": "Benchmark iPhone", "Product Type": "iPhone14,2"}))
+    os.remove(db_path)
+
+def generate_source(source, rows, data_dir):
+    """Generate (once) the base evidence file for a source at a scale"""
+    extension = ".zip" if source.endswith("backup") else ".db"
+    path = os.path.join(data_dir, f"{source}_{rows}{extension}")
+    if not os.path.exists(path):
+        if source == "android_db":
+            create_android_db(path, rows)
+        elif source == "ios_db":
+            create_ios_db(path, rows)
+        elif source == "android_backup":
+            create_android_backup(path, rows, data_dir)
+        else:
+            create_ios_backup(path, rows, data_dir)
+    return path
+
+def unique_copy(path, run_dir):
+    """Copy an evidence file with a unique marker so the dedup cache never short-circuits ingest"""
+    copy_path = os.path.join(run_dir, os.path.basename(path))
+    shutil.copyfile(path, copy_path)
+    marker = uuid.uuid4().hex
+    if copy_path.endswith(".zip"):
+        with zipfile.ZipFile(copy_path, "a") as archive:
+            archive.writestr("benchmark_run.txt", marker)
+    else:
+        conn = sqlite3.connect(copy_path)
+        conn.execute("CREATE TABLE benchmark_run (marker TEXT)")
+        conn.execute("INSERT INTO benchmark_run VALUES (?)", (marker,))
+        conn.commit()
+        conn.close()
+    return copy_path
+
+class RSSSampler:
+    """Sample the resident set size of this process and its descendants in the background"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    @staticmethod
+    def tree_rss():
+        """Current RSS in bytes of this process plus every descendant (ingest workers)"""
+        children = {}
+        rss = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as stat:
+                    fields = stat.read().rsplit(")", 1)[1].split()
+                children.setdefault(int(fields[1]), []).append(int(entry))
+                rss[int(entry)] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, IndexError, ValueError):
+                continue
+
+        total = 0
+        pending = [os.getpid()]
+        while pending:
+            pid = pending.pop()
+            total += rss.get(pid, 0)
+            pending.extend(children.get(pid, []))
+        return total
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, self.tree_rss())
+            self.stopped.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.tree_rss()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, self.tree_rss())
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def summarize(measurements):
+    """Aggregate the runs of one stage into latency percentiles, throughput and peak RSS"""
+    seconds = sum(m["seconds"] for m in measurements)
+    latencies = [latency for m in measurements for latency in m["latencies"]]
+    rows = sum(m["rows"] for m in measurements)
+    size = sum(m["bytes"] for m in measurements)
+    return {
+        "runs": len(measurements),
+        "samples": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "rows_per_s": round(rows / seconds, 1) if seconds and rows else None,
+        "mb_per_s": round(size / seconds / 1e6, 3) if seconds and size else None,
+        "peak_rss_mb": round(max(m["peak_rss"] for m in measurements) / 1e6, 1)
+    }
+
+class BenchmarkRunner:
+    """Drive evidence through the API in-process and measure each stage"""
+
+    def __init__(self, client, server, browse_pages):
+        self.client = client
+        self.server = server
+        self.browse_pages = browse_pages
+
+    def measure(self, stage, func):
+        """Run one stage under the RSS sampler; func returns (latencies, rows, bytes)"""
+        with RSSSampler() as sampler:
+            start = time.perf_counter()
+            latencies, rows, size = func()
+            seconds = time.perf_counter() - start
+        return stage, {
+            "seconds": seconds,
+            "latencies": latencies or [seconds],
+            "rows": rows,
+            "bytes": size,
+            "peak_rss": sampler.peak
+        }
+
+    def wait_for_job(self, job_id):
+        """Poll an ingest job until it finishes"""
+        while True:
+            job = self.client.get(f"/api/jobs/{job_id}").json()["job"]
+            if job["status"] in ("done", "failed"):
+                if job["status"] == "failed":
+                    raise RuntimeError(f"Ingest failed: {job.get('error')}")
+                return job
+            time.sleep(0.02)
+
+    def run_once(self, evidence_path):
+        """Upload, ingest, browse, export and delete one evidence file"""
+        case = self.client.post("/api/cases", json={
+            "case_name": f"Benchmark {datetime.utcnow().isoformat()}",
+            "investigator": "backend_benchmark"
+        }).json()["case"]
+        case_id = case["case_id"]
+        size = os.path.getsize(evidence_path)
+        state = {}
+
+        def upload():
+            with open(evidence_path, "rb") as evidence:
+                response = self.client.post(
+                    f"/api/cases/{case_id}/upload",
+                    files={"file": (os.path.basename(evidence_path), evidence, "application/octet-stream")}
+                )
+            response.raise_for_status()
+            state.update(response.json())
+            return None, 0, size
+
+        def ingest():
+            job = self.wait_for_job(state["job_id"])
+            state["rows"] = sum(job["summary"].values())
+            return None, state["rows"], size
+
+        def browse():
+            latencies, rows, params = [], 0, {"limit": 500}
+            for _ in range(self.browse_pages):
+                start = time.perf_counter()
+                page = self.client.get(f"/api/cases/{case_id}/records/messages", params=params).json()
+                latencies.append(time.perf_counter() - start)
+                rows += len(page["records"])
+                if not page["next_cursor"]:
+                    break
+                params["cursor"] = page["next_cursor"]
+            return latencies, rows, 0
+
+        def export(export_format):
+            def run():
+                start = time.perf_counter()
+                latencies, exported = [], 0
+                with self.client.stream("POST", "/api/export", json={
+                    "case_id": case_id,
+                    "data_types": ["messages", "contacts", "call_logs"],
+                    "export_format": export_format
+                }) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_bytes():
+                        latencies.append(time.perf_counter() - start)
+                        start = time.perf_counter()
+                        exported += len(chunk)
+                return latencies, state["rows"], exported
+            return run
+
+        def cleanup():
+            response = self.client.delete(f"/api/cases/{case_id}/evidence/{state['evidence_id']}")
+            response.raise_for_status()
+            return None, state["rows"], 0
+
+        return dict([
+            self.measure("upload", upload),
+            self.measure("ingest", ingest),
+            self.measure("browse", browse),
+            self.measure("export_json", export("json")),
+            self.measure("export_csv", export("csv")),
+            self.measure("cleanup", cleanup)
+        ])
+
+def git_commit():
+    """Commit the benchmark ran against, if this is a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_server(use_mongomock):
+    """Import the backend app, optionally on an in-memory MongoDB stand-in"""
+    os.environ.setdefault('MONGO_URL', DEFAULT_MONGO_URL)
+    if use_mongomock:
+        import mongomock
+        import pymongo
+        pymongo.MongoClient = mongomock.MongoClient
+    sys.path.insert(0, BACKEND_DIR)
+    import server
+    return server
+
+def run_benchmarks(args):
+    """Generate the evidence, run every (scale, source) combination and collect the results"""
+    from concurrent.futures import ThreadPoolExecutor
+    from fastapi.testclient import TestClient
+
+    server = load_server(args.mongomock)
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="cf_benchmark_")
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+
+    try:
+        with TestClient(server.app) as client:
+            if args.mongomock:
+                # Worker processes cannot see an in-memory database
+                server.ingest_executor.shutdown(wait=False)
+                server.ingest_executor = ThreadPoolExecutor(max_workers=server.INGEST_WORKERS)
+            runner = BenchmarkRunner(client, server, args.browse_pages)
+
+            for scale in args.scales:
+                for source in args.sources:
+                    print(f"\n--- {source} @ {scale:,} rows ---")
+                    start = time.perf_counter()
+                    base_path = generate_source(source, scale, data_dir)
+                    print(f"Generated {os.path.getsize(base_path) / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s")
+
+                    runs = {stage: [] for stage in STAGES}
+                    for run in range(args.repeat):
+                        run_dir = tempfile.mkdtemp(prefix="run_", dir=data_dir)
+                        try:
+                            measured = runner.run_once(unique_copy(base_path, run_dir))
+                        finally:
+                            shutil.rmtree(run_dir, ignore_errors=True)
+                        for stage, measurement in measured.items():
+                            runs[stage].append(measurement)
+                        print(f"  run {run + 1}: " + ", ".join(
+                            f"{stage} {measurement['seconds']:.2f}s" for stage, measurement in measured.items()
+                        ))
+
+                    stages = {stage: summarize(measurements) for stage, measurements in runs.items()}
+                    results.append({"scale": scale, "source": source, "stages": stages})
+                    print_stages(stages)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "mongo": "mongomock" if args.mongomock else os.environ['MONGO_URL'],
+            "repeat": args.repeat
+        },
+        "results": results
+    }
+
+def print_stages(stages):
+    """Print one result block as a table"""
+    print(f"  {'stage':<12}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'rows/s':>14}{'MB/s':>10}{'peak MB':>10}")
+    for stage, stats in stages.items():
+        print(f"  {stage:<12}{stats['p50_ms']:>12.2f}{stats['p95_ms']:>12.2f}{stats['p99_ms']:>12.2f}"
+              f"{stats['rows_per_s'] or 0:>14,.0f}{stats['mb_per_s'] or 0:>10.2f}{stats['peak_rss_mb']:>10.1f}")
+
+def compare_results(baseline_path, current_path, threshold):
+    """Print per-stage changes between two result files; returns the number of regressions"""
+    with open(baseline_path) as baseline_file, open(current_path) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+
+    print(f"Baseline {baseline['meta'].get('git_commit')} vs current {current['meta'].get('git_commit')}")
+    baseline_stages = {
+        (result["scale"], result["source"], stage): stats
+        for result in baseline["results"] for stage, stats in result["stages"].items()
+    }
+
+    regressions = 0
+    for result in current["results"]:
+        print(f"\n--- {result['source']} @ {result['scale']:,} rows ---")
+        for stage, stats in result["stages"].items():
+            before = baseline_stages.get((result["scale"], result["source"], stage))
+            if not before:
+                print(f"  {stage:<12} (no baseline)")
+                continue
+            changes = []
+            for key, higher_is_better in (("p50_ms", False), ("p99_ms", False), ("rows_per_s", True), ("peak_rss_mb", False)):
+                if not before.get(key) or stats.get(key) is None:
+                    continue
+                change = (stats[key] - before[key]) / before[key] * 100
+                worse = -change if higher_is_better else change
+                flag = ""
+                if worse > threshold:
+                    flag = " ❌"
+                    regressions += 1
+                changes.append(f"{key} {before[key]:g} -> {stats[key]:g} ({change:+.1f}%){flag}")
+            print(f"  {stage:<12} " + "; ".join(changes))
+
+    print(f"\n{'❌' if regressions else '✅'} {regressions} regression(s) beyond {threshold:g}%")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CyberForensics ingest and export")
+    parser.add_argument("--scales", default="10k", help="comma-separated row counts, e.g. 10k,100k,1M,10M")
+    parser.add_argument("--sources", default=",".join(SOURCES), help=f"comma-separated subset of {','.join(SOURCES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scale and source")
+    parser.add_argument("--browse-pages", type=int, default=20, help="record pages to fetch per run")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--data-dir", help="keep generated evidence here and reuse it between invocations")
+    parser.add_argument("--mongomock", action="store_true", help="use an in-memory MongoDB stand-in")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare_results(*args.compare, args.threshold) else 0)
+
+    args.scales = [parse_scale(scale) for scale in args.scales.split(",")]
+    args.sources = [source.strip() for source in args.sources.split(",")]
+    unknown = set(args.sources) - set(SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+
+    print("Starting CyberForensics Ingest/Export Benchmark")
+    results = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
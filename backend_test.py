@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 import unittest
+import unittest.mock
 import requests
+import sys
+import tracemalloc
 import json
 import os
 import sqlite3
 import tempfile
+import shutil
 import hashlib
 import re
+import time
+import io
+import zipfile
+import plistlib
 from datetime import datetime
 
 # Get backend URL from frontend .env file
@@ -114,6 +122,25 @@ class TestCyberForensicsBackend(unittest.TestCase):
                 sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
 
+    def get_case_summary(self, case_id):
+        """Fetch a case's stored record counts from the case list"""
+        response = requests.get(f"{API_URL}/cases")
+        self.assertEqual(response.status_code, 200, "Case list should return 200 OK")
+        case = next(case for case in response.json()["cases"] if case["case_id"] == case_id)
+        return case["summary"]
+
+    def wait_for_job(self, job_id, timeout=60):
+        """Poll an ingest or verification job until it finishes"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            response = requests.get(f"{API_URL}/jobs/{job_id}")
+            self.assertEqual(response.status_code, 200, "Job status should return 200 OK")
+            job = response.json()["job"]
+            if job["status"] in ("done", "failed"):
+                return job
+            time.sleep(0.5)
+        self.fail(f"Job {job_id} did not finish within {timeout} seconds")
+
     def test_01_health_check(self):
         """Test health check endpoint"""
         print("\n--- Testing Health Check API ---")
@@ -219,7 +246,8 @@ class TestCyberForensicsBackend(unittest.TestCase):
         self.assertTrue(data["success"], "Response should indicate success")
         self.assertTrue("evidence_id" in data, "Response should include evidence ID")
         self.assertTrue("file_hash" in data, "Response should include file hash")
-        self.assertTrue("summary" in data, "Response should include data summary")
+        self.assertTrue("job_id" in data, "Response should include ingest job ID")
+        self.assertEqual(data["status"], "queued", "Ingest job should start out queued")
         
         # Store evidence_id for later tests
         self.evidence_id = data["evidence_id"]
@@ -227,8 +255,14 @@ class TestCyberForensicsBackend(unittest.TestCase):
         # Verify file hash
         self.assertEqual(data["file_hash"], expected_hash, "File hash should match calculated hash")
         
+        # Wait for background parsing to finish
+        job = self.wait_for_job(data["job_id"])
+        self.assertEqual(job["status"], "done", f"Ingest job should succeed: {job.get('error')}")
+        self.assertEqual(job["evidence_id"], self.evidence_id, "Job should reference the uploaded evidence")
+        self.assertEqual(job["rows_parsed"], 9, "Job should report 9 parsed rows")
+        
         # Verify data extraction
-        summary = data["summary"]
+        summary = job["summary"]
         self.assertEqual(summary["messages_count"], 3, "Should extract 3 messages")
         self.assertEqual(summary["contacts_count"], 3, "Should extract 3 contacts")
         self.assertEqual(summary["call_logs_count"], 3, "Should extract 3 call logs")
@@ -277,6 +311,11 @@ class TestCyberForensicsBackend(unittest.TestCase):
         self.assertEqual(summary["contacts_count"], 3, "Should have 3 contacts")
         self.assertEqual(summary["call_logs_count"], 3, "Should have 3 call logs")
         
+        # Verify the case-level counts maintained at ingest
+        cases = requests.get(f"{API_URL}/cases").json()["cases"]
+        case = next(c for c in cases if c["case_id"] == self.case_id)
+        self.assertGreaterEqual(case["summary"]["messages_count"], 3, "Case summary should include ingested messages")
+        
         print(f"✅ Evidence retrieval API working correctly")
         print(f"✅ Evidence summary verified: {summary}")
 
@@ -299,12 +338,14 @@ class TestCyberForensicsBackend(unittest.TestCase):
         # Verify response
         self.assertEqual(response.status_code, 200, "JSON export should return 200 OK")
         self.assertEqual(response.headers["Content-Type"], "application/json", "Content type should be JSON")
-        self.assertTrue("X-Export-Hash" in response.headers, "Response should include export hash header")
+        self.assertTrue("X-Export-Id" in response.headers, "Response should include export ID header")
         self.assertTrue("Content-Disposition" in response.headers, "Response should include content disposition header")
         
-        # Verify export hash
-        export_hash = response.headers["X-Export-Hash"]
-        calculated_hash = hashlib.sha256(response.content).hexdigest()
+        # Verify export hash, which is recorded once the stream completes
+        history = requests.get(f"{API_URL}/exports/{self.case_id}").json()["exports"]
+        export_record = next(e for e in history if e["export_id"] == response.headers["X-Export-Id"])
+        export_hash = export_record["file_hash"]
+        calculated_hash = hashlib.sha512(response.content).hexdigest()
         self.assertEqual(export_hash, calculated_hash, "Export hash should match calculated hash")
         
         # Verify export data
@@ -332,7 +373,7 @@ class TestCyberForensicsBackend(unittest.TestCase):
         self.assertEqual(len(data["call_logs"]), 3, "Should export 3 call logs")
         
         print(f"✅ JSON export successful with ID: {self.export_id}")
-        print(f"✅ SHA-256 hash verified: {export_hash}")
+        print(f"✅ SHA-512 hash verified: {export_hash}")
         print(f"✅ Exported: {len(data['messages'])} messages, {len(data['contacts'])} contacts, {len(data['call_logs'])} call logs")
 
     def test_07_export_csv(self):
@@ -345,7 +386,7 @@ class TestCyberForensicsBackend(unittest.TestCase):
         
         export_data = {
             "case_id": self.case_id,
-            "data_types": ["messages"],  # Just export messages for simplicity
+            "data_types": ["messages", "call_logs"],
             "export_format": "csv"
         }
         
@@ -353,28 +394,43 @@ class TestCyberForensicsBackend(unittest.TestCase):
         
         # Verify response
         self.assertEqual(response.status_code, 200, "CSV export should return 200 OK")
-        self.assertEqual(response.headers["Content-Type"], "text/csv", "Content type should be CSV")
-        self.assertTrue("X-Export-Hash" in response.headers, "Response should include export hash header")
+        self.assertEqual(response.headers["Content-Type"], "application/zip", "Content type should be ZIP")
+        self.assertTrue("X-Export-Id" in response.headers, "Response should include export ID header")
         self.assertTrue("Content-Disposition" in response.headers, "Response should include content disposition header")
         
-        # Verify export hash
-        export_hash = response.headers["X-Export-Hash"]
-        calculated_hash = hashlib.sha256(response.content).hexdigest()
+        # Verify export hash, which is recorded once the stream completes
+        history = requests.get(f"{API_URL}/exports/{self.case_id}").json()["exports"]
+        export_record = next(e for e in history if e["export_id"] == response.headers["X-Export-Id"])
+        export_hash = export_record["file_hash"]
+        calculated_hash = hashlib.sha512(response.content).hexdigest()
         self.assertEqual(export_hash, calculated_hash, "Export hash should match calculated hash")
         
-        # Verify CSV content
-        csv_content = response.content.decode('utf-8')
-        self.assertTrue(len(csv_content) > 0, "CSV content should not be empty")
+        # Verify one CSV per data type plus a manifest
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        self.assertEqual(
+            sorted(archive.namelist()), ["call_logs.csv", "manifest.json", "messages.csv"],
+            "ZIP should contain one CSV per data type and a manifest"
+        )
+        manifest = json.loads(archive.read("manifest.json"))
+        
+        for member in ("messages.csv", "call_logs.csv"):
+            content = archive.read(member)
+            self.assertEqual(
+                hashlib.sha512(content).hexdigest(), manifest["members"][member]["file_hash"],
+                f"{member} hash should match the manifest"
+            )
+            
+            # Count rows (header + 3 data rows)
+            rows = content.decode('utf-8').strip().split('\n')
+            self.assertEqual(len(rows), 4, f"{member} should have 4 rows (header + 3 data rows)")
+        
+        csv_content = archive.read("messages.csv").decode('utf-8')
         self.assertTrue("address" in csv_content, "CSV should include message address field")
         self.assertTrue("body" in csv_content, "CSV should include message body field")
         
-        # Count rows (header + 3 data rows)
-        rows = csv_content.strip().split('\n')
-        self.assertEqual(len(rows), 4, "CSV should have 4 rows (header + 3 data rows)")
-        
         print(f"✅ CSV export successful")
-        print(f"✅ SHA-256 hash verified: {export_hash}")
-        print(f"✅ CSV format verified with {len(rows)-1} data rows")
+        print(f"✅ SHA-512 hash verified: {export_hash}")
+        print(f"✅ ZIP verified with members {archive.namelist()}")
 
     def test_08_export_history(self):
         """Test export history endpoint"""
@@ -425,6 +481,10 @@ class TestCyberForensicsBackend(unittest.TestCase):
         response = requests.get(f"{API_URL}/cases/{invalid_case_id}/evidence")
         self.assertEqual(response.status_code, 404, "Invalid case ID should return 404")
         
+        # Test invalid job ID
+        response = requests.get(f"{API_URL}/jobs/invalid-job-id")
+        self.assertEqual(response.status_code, 404, "Invalid job ID should return 404")
+        
         # Test invalid export format
         if not self.case_id:
             self.test_02_create_case()
@@ -439,6 +499,757 @@ class TestCyberForensicsBackend(unittest.TestCase):
         
         print(f"✅ Error handling working correctly")
 
+    def test_10_upload_backup_zip(self):
+        """Test backup archive upload with per-member hashing"""
+        print("\n--- Testing Backup Archive Upload API ---")
+        
+        if not self.case_id:
+            self.test_02_create_case()
+        
+        # Build a small backup archive with a database and a plist
+        with open(self.db_file, 'rb') as f:
+            db_content = f.read()
+        plist_content = plistlib.dumps({"name": "Backup Contact", "phone": "+1234567890"})
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr("HomeDomain/Library/SMS/sms.db", db_content)
+            zip_ref.writestr("HomeDomain/Library/Preferences/contact.plist", plist_content)
+        
+        files = {'file': ('backup.zip', archive.getvalue(), 'application/zip')}
+        response = requests.post(f"{API_URL}/cases/{self.case_id}/upload", files=files)
+        self.assertEqual(response.status_code, 200, "Backup upload should return 200 OK")
+        data = response.json()
+        
+        job = self.wait_for_job(data["job_id"])
+        self.assertEqual(job["status"], "done", f"Ingest job should succeed: {job.get('error')}")
+        self.assertEqual(job["summary"]["messages_count"], 3, "Should extract 3 messages")
+        self.assertEqual(job["summary"]["contacts_count"], 4, "Should extract 3 contacts and 1 plist")
+        self.assertEqual(job["summary"]["call_logs_count"], 3, "Should extract 3 call logs")
+        
+        # Verify every member was hashed
+        response = requests.get(f"{API_URL}/evidence/{data['evidence_id']}/members")
+        self.assertEqual(response.status_code, 200, "Member listing should return 200 OK")
+        members = {m["name"]: m for m in response.json()["members"]}
+        self.assertEqual(
+            members["HomeDomain/Library/SMS/sms.db"]["file_hash"], hashlib.sha512(db_content).hexdigest(),
+            "Database member hash should match"
+        )
+        self.assertEqual(
+            members["HomeDomain/Library/Preferences/contact.plist"]["file_hash"], hashlib.sha512(plist_content).hexdigest(),
+            "Plist member hash should match"
+        )
+        
+        print(f"✅ Backup archive processed with {len(members)} hashed members")
+
+    def test_11_duplicate_upload_cache(self):
+        """Test that re-uploaded evidence reuses the parsed records"""
+        print("\n--- Testing Evidence Dedup Cache ---")
+        
+        # Ensure the file has been ingested once
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        # Upload the identical file to a second case
+        response = requests.post(f"{API_URL}/cases", json={
+            "case_name": "Duplicate Evidence Case",
+            "investigator": "John Investigator"
+        })
+        second_case_id = response.json()["case"]["case_id"]
+        
+        with open(self.db_file, 'rb') as f:
+            files = {'file': ('test_forensics.db', f, 'application/octet-stream')}
+            response = requests.post(f"{API_URL}/cases/{second_case_id}/upload", files=files)
+        
+        self.assertEqual(response.status_code, 200, "Evidence upload should return 200 OK")
+        data = response.json()
+        self.assertTrue(data.get("cache_hit"), "Identical evidence should be recognised")
+        self.assertEqual(data["status"], "done", "Cached evidence should not need parsing")
+        
+        job = self.wait_for_job(data["job_id"])
+        self.assertEqual(job["summary"]["messages_count"], 3, "Cached evidence should link 3 messages")
+        
+        # Removing the linked evidence must leave the original case intact
+        response = requests.delete(f"{API_URL}/cases/{second_case_id}/evidence/{data['evidence_id']}")
+        self.assertEqual(response.status_code, 200, "Evidence deletion should return 200 OK")
+        self.assertFalse(response.json()["records_removed"], "Records still referenced should be kept")
+        
+        # A second copy in the same case must not count its records twice
+        before = self.get_case_summary(self.case_id)
+        with open(self.db_file, 'rb') as f:
+            files = {'file': ('test_forensics_copy.db', f, 'application/octet-stream')}
+            response = requests.post(f"{API_URL}/cases/{self.case_id}/upload", files=files)
+        self.assertTrue(response.json().get("cache_hit"), "Identical evidence should be recognised")
+        self.assertEqual(self.get_case_summary(self.case_id), before, "Case counts should not change for a duplicate")
+        
+        requests.delete(f"{API_URL}/cases/{self.case_id}/evidence/{response.json()['evidence_id']}")
+        self.assertEqual(self.get_case_summary(self.case_id), before, "Removing a duplicate should keep the case counts")
+        
+        print(f"✅ Duplicate upload linked without re-parsing")
+
+    def test_12_search_messages(self):
+        """Test full-text message search"""
+        print("\n--- Testing Message Search API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/search", params={"q": "important"})
+        self.assertEqual(response.status_code, 200, "Search should return 200 OK")
+        data = response.json()
+        self.assertTrue(len(data["hits"]) >= 1, "Search should find the matching message")
+        
+        top_hit = data["hits"][0]
+        self.assertEqual(top_hit["record"]["body"], "Evidence message with important data", "Top hit should be the matching message")
+        self.assertTrue("score" in top_hit, "Hits should be ranked with a score")
+        
+        # Missing query and unknown case
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/search")
+        self.assertEqual(response.status_code, 422, "Search without a query should be rejected")
+        response = requests.get(f"{API_URL}/cases/invalid-case-id/search", params={"q": "test"})
+        self.assertEqual(response.status_code, 404, "Search in an unknown case should return 404")
+        
+        print(f"✅ Search found {len(data['hits'])} hits")
+
+    def test_13_browse_records(self):
+        """Test cursor-paginated, filtered record browsing"""
+        print("\n--- Testing Record Browsing API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        # Walk every message page by page
+        records = []
+        params = {"limit": 2}
+        while True:
+            response = requests.get(f"{API_URL}/cases/{self.case_id}/records/messages", params=params)
+            self.assertEqual(response.status_code, 200, "Record browsing should return 200 OK")
+            data = response.json()
+            self.assertTrue(len(data["records"]) <= 2, "Pages should respect the limit")
+            records.extend(data["records"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+        
+        timestamps = [record["timestamp"] for record in records]
+        self.assertTrue(len(records) >= 3, "Paging should reach every message")
+        self.assertEqual(timestamps, sorted(timestamps), "Pages should be ordered by timestamp")
+        
+        # Phone numbers match regardless of formatting; dates filter by epoch ms
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/records/messages", params={"phone": "+1 (555) 123-4567"})
+        self.assertTrue(all(r["record"]["address"] == "+5551234567" for r in response.json()["records"]), "Phone filter should match normalized numbers")
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/records/call_logs", params={"since": 1625184000000, "table": "calls"})
+        self.assertTrue(all(r["timestamp"] >= 1625184000000 for r in response.json()["records"]), "Date filter should exclude older calls")
+        
+        # Bad cursor and unknown data type
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/records/messages", params={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400, "Invalid cursor should return 400")
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/records/photos")
+        self.assertEqual(response.status_code, 404, "Unknown data type should return 404")
+        
+        print(f"✅ Browsed {len(records)} messages")
+
+    def test_14_query_plans(self):
+        """Test that the hot queries are served by indexes"""
+        print("\n--- Testing Query Plan Diagnostics API ---")
+        
+        response = requests.get(f"{API_URL}/diagnostics/query-plans", params={"case_id": self.case_id})
+        self.assertEqual(response.status_code, 200, "Query plan diagnostics should return 200 OK")
+        data = response.json()
+        self.assertEqual(data["collscans"], [], "No hot query should fall back to a collection scan")
+        
+        for name, plan in data["plans"].items():
+            self.assertFalse("error" in plan, f"Explain should succeed for {name}")
+        
+        print(f"✅ {len(data['plans'])} hot queries use indexes")
+
+    def test_15_case_timeline(self):
+        """Test the materialized timeline and top counterparties"""
+        print("\n--- Testing Case Timeline API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/timeline", params={"top": 1})
+        self.assertEqual(response.status_code, 200, "Timeline should return 200 OK")
+        data = response.json()
+        
+        days = {day["day"]: day for day in data["days"]}
+        self.assertTrue("2021-07-01" in days, "Timeline should bucket records by day")
+        self.assertTrue(days["2021-07-01"]["messages"] >= 1, "Messages should be counted per day")
+        
+        top = data["top_counterparties"]
+        self.assertEqual(len(top), 1, "Top counterparties should respect the limit")
+        self.assertEqual(top[0]["phone"], "5551234567", "Longest total call duration should rank first")
+        self.assertTrue(top[0]["call_duration"] >= 300, "Call durations should be summed")
+        
+        response = requests.get(f"{API_URL}/cases/invalid-case-id/timeline")
+        self.assertEqual(response.status_code, 404, "Timeline of an unknown case should return 404")
+        
+        print(f"✅ Timeline covers {len(data['days'])} days")
+
+    def test_16_metrics(self):
+        """Test the Prometheus metrics endpoint"""
+        print("\n--- Testing Metrics API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        response = requests.get(f"{API_URL}/metrics")
+        self.assertEqual(response.status_code, 200, "Metrics should return 200 OK")
+        self.assertTrue(response.headers["Content-Type"].startswith("text/plain"), "Metrics should be Prometheus text")
+        
+        text = response.text
+        self.assertTrue("# TYPE cyberforensics_rows_parsed_total counter" in text, "Metric types should be declared")
+        self.assertTrue('cyberforensics_rows_parsed_total{data_type="messages",table="sms"}' in text, "Parsed rows should be counted per table")
+        self.assertTrue('cyberforensics_stage_seconds_count{stage="parse"}' in text, "Ingest stages should be timed")
+        
+        print(f"✅ Metrics endpoint exposes {len(text.splitlines())} lines")
+
+    def test_17_cached_export(self):
+        """Test that repeat exports are served from the stored artifact"""
+        print("\n--- Testing Cached Export Artifacts ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        export_request = {
+            "case_id": self.case_id,
+            "data_types": ["messages", "call_logs"],
+            "export_format": "json"
+        }
+        first = requests.post(f"{API_URL}/export", json=export_request)
+        self.assertEqual(first.status_code, 200, "First export should return 200 OK")
+        second = requests.post(f"{API_URL}/export", json=export_request)
+        self.assertEqual(second.status_code, 200, "Repeat export should return 200 OK")
+        
+        self.assertEqual(second.headers["X-Export-Id"], first.headers["X-Export-Id"], "Repeat export should reuse the artifact")
+        self.assertEqual(second.content, first.content, "Repeat export should be byte-identical")
+        self.assertEqual(second.headers["X-Export-Hash"], hashlib.sha512(second.content).hexdigest(), "Artifact hash should match its content")
+        
+        # New evidence invalidates the artifact
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO sms (address, body, date, type) VALUES ('+1234567890', 'Follow-up message', 1625356800000, 1)")
+        conn.commit()
+        conn.close()
+        with open(self.db_file, "rb") as f:
+            response = requests.post(
+                f"{API_URL}/cases/{self.case_id}/upload",
+                files={"file": ("test_forensics_2.db", f, "application/octet-stream")}
+            )
+        self.wait_for_job(response.json()["job_id"])
+        third = requests.post(f"{API_URL}/export", json=export_request)
+        self.assertNotEqual(third.headers["X-Export-Id"], first.headers["X-Export-Id"], "Evidence changes should invalidate artifacts")
+        
+        print(f"✅ Repeat export served from artifact {second.headers['X-Export-Id']}")
+
+    def test_18_export_ndjson(self):
+        """Test NDJSON export format"""
+        print("\n--- Testing NDJSON Export API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        response = requests.post(f"{API_URL}/export", json={
+            "case_id": self.case_id,
+            "data_types": ["messages", "contacts", "call_logs"],
+            "export_format": "ndjson"
+        })
+        self.assertEqual(response.status_code, 200, "NDJSON export should return 200 OK")
+        self.assertEqual(response.headers["Content-Type"], "application/x-ndjson", "Content type should be application/x-ndjson")
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertTrue("export_metadata" in lines[0], "First line should hold the export metadata")
+        self.assertTrue("export_summary" in lines[-1], "Last line should hold the export summary")
+        
+        records = lines[1:-1]
+        messages = [line["record"] for line in records if line["data_type"] == "messages"]
+        self.assertEqual(len(records), sum(lines[-1]["export_summary"]["records"].values()), "Summary should count every record line")
+        self.assertTrue(any(m["body"] == "Evidence message with important data" for m in messages), "Records should be exported one per line")
+        
+        print(f"✅ NDJSON export returned {len(records)} records")
+
+    def test_19_export_columnar(self):
+        """Test Parquet and Arrow IPC export formats"""
+        print("\n--- Testing Columnar Export API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        for export_format, extension, magic in (("parquet", "parquet", b"PAR1"), ("arrow", "arrow", b"ARROW1")):
+            response = requests.post(f"{API_URL}/export", json={
+                "case_id": self.case_id,
+                "data_types": ["messages", "contacts", "call_logs"],
+                "export_format": export_format
+            })
+            self.assertEqual(response.status_code, 200, f"{export_format} export should return 200 OK")
+            self.assertEqual(response.headers["Content-Type"], "application/zip", "Content type should be application/zip")
+            
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                manifest = json.loads(archive.read("manifest.json"))
+                for data_type in ["messages", "contacts", "call_logs"]:
+                    member_name = f"{data_type}.{extension}"
+                    data = archive.read(member_name)
+                    self.assertTrue(data.startswith(magic) and data.endswith(magic), f"{member_name} should be a complete {export_format} file")
+                    self.assertEqual(hashlib.sha512(data).hexdigest(), manifest["members"][member_name]["file_hash"], f"{member_name} hash should match manifest")
+                
+                columns = {column["name"]: column["type"] for column in manifest["members"][f"messages.{extension}"]["schema"]}
+                self.assertEqual(columns["date"], "int64", "Numeric columns should keep their type")
+                self.assertEqual(columns["body"], "string", "Text columns should be strings")
+        
+        print(f"✅ Parquet and Arrow exports validated")
+
+    def test_20_blob_offload(self):
+        """Test that large BLOBs are offloaded and served with Range support"""
+        print("\n--- Testing BLOB Offload API ---")
+        
+        attachment = os.urandom(8192)
+        db_file = tempfile.gettempdir() + "/test_forensics_blob.db"
+        if os.path.exists(db_file):
+            os.remove(db_file)
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE sms (id INTEGER PRIMARY KEY, address TEXT, body TEXT, date INTEGER, attachment BLOB)")
+        conn.execute("INSERT INTO sms (address, body, date, attachment) VALUES ('+15550001111', 'Photo message', 1625097600000, ?)", (attachment,))
+        conn.commit()
+        conn.close()
+        
+        with open(db_file, "rb") as f:
+            response = requests.post(
+                f"{API_URL}/cases/{self.case_id}/upload",
+                files={"file": ("test_forensics_blob.db", f, "application/octet-stream")}
+            )
+        os.remove(db_file)
+        self.wait_for_job(response.json()["job_id"])
+        
+        response = requests.get(f"{API_URL}/cases/{self.case_id}/records/messages", params={"phone": "+15550001111"})
+        reference = response.json()["records"][0]["record"]["attachment"]
+        self.assertEqual(reference["blob_ref"], hashlib.sha256(attachment).hexdigest(), "BLOB should be replaced by its SHA-256 reference")
+        self.assertEqual(reference["size"], len(attachment), "Reference should carry the BLOB size")
+        
+        response = requests.get(f"{API_URL}/blobs/{reference['blob_ref']}")
+        self.assertEqual(response.status_code, 200, "Blob fetch should return 200 OK")
+        self.assertEqual(response.content, attachment, "Blob content should round-trip")
+        
+        response = requests.get(f"{API_URL}/blobs/{reference['blob_ref']}", headers={"Range": "bytes=100-199"})
+        self.assertEqual(response.status_code, 206, "Range request should return 206 Partial Content")
+        self.assertEqual(response.headers["Content-Range"], f"bytes 100-199/{len(attachment)}", "Content-Range should describe the slice")
+        self.assertEqual(response.content, attachment[100:200], "Range request should return the requested bytes")
+        
+        response = requests.get(f"{API_URL}/blobs/{reference['blob_ref']}", headers={"Range": "bytes=99999-"})
+        self.assertEqual(response.status_code, 416, "Unsatisfiable range should return 416")
+        
+        print(f"✅ BLOB offloaded as {reference['blob_ref'][:16]}...")
+
+    def test_21_resumable_upload(self):
+        """Test resumable chunked uploads"""
+        print("\n--- Testing Resumable Upload API ---")
+        
+        # Ensure we have a case_id
+        if not self.case_id:
+            self.test_02_create_case()
+        
+        with open(self.db_file, "rb") as f:
+            content = f.read()
+        chunk_size = 1024
+        
+        response = requests.post(f"{API_URL}/cases/{self.case_id}/uploads", json={
+            "filename": "test_forensics_chunked.db",
+            "file_size": len(content),
+            "chunk_size": chunk_size
+        })
+        self.assertEqual(response.status_code, 200, "Upload session should be created")
+        session = response.json()
+        upload_id = session["upload_id"]
+        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+        self.assertEqual(session["missing_chunks"], list(range(len(chunks))), "Every chunk should start missing")
+        
+        # Send chunks out of order, leaving one behind
+        for index in reversed(range(1, len(chunks))):
+            response = requests.put(
+                f"{API_URL}/uploads/{upload_id}/chunks/{index}", data=chunks[index],
+                headers={"X-Chunk-SHA256": hashlib.sha256(chunks[index]).hexdigest()}
+            )
+            self.assertEqual(response.status_code, 200, f"Chunk {index} should be accepted")
+        
+        response = requests.post(f"{API_URL}/uploads/{upload_id}/finalize")
+        self.assertEqual(response.status_code, 409, "Finalize should wait for missing chunks")
+        self.assertEqual(requests.get(f"{API_URL}/uploads/{upload_id}").json()["missing_chunks"], [0], "Status should list the missing chunk")
+        
+        # Resume with the missing chunk and finalize
+        requests.put(f"{API_URL}/uploads/{upload_id}/chunks/0", data=chunks[0])
+        response = requests.post(f"{API_URL}/uploads/{upload_id}/finalize")
+        self.assertEqual(response.status_code, 200, "Finalize should return 200 OK")
+        data = response.json()
+        
+        level = [hashlib.sha256(chunk).digest() for chunk in chunks]
+        while len(level) > 1:
+            level = [hashlib.sha256(level[i] + level[i + 1]).digest() if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+        self.assertEqual(data["merkle_root"], level[0].hex(), "Merkle root should cover every chunk hash")
+        self.assertEqual(data["file_hash"], hashlib.sha512(content).hexdigest(), "SHA-512 should cover the whole file")
+        
+        job = self.wait_for_job(data["job_id"])
+        self.assertEqual(job["status"], "done", "Finalized upload should be ingested")
+        
+        print(f"✅ Resumable upload of {len(chunks)} chunks finalized")
+
+    def test_22_verify_integrity(self):
+        """Test re-verification of stored evidence and exports"""
+        print("\n--- Testing Integrity Verification API ---")
+        
+        # Ensure we have uploaded evidence
+        if not self.evidence_id:
+            self.test_04_upload_evidence()
+        
+        # Export, then change the case's evidence: the past export must stay verifiable
+        response = requests.post(f"{API_URL}/export", json={
+            "case_id": self.case_id,
+            "data_types": ["messages"],
+            "export_format": "json"
+        })
+        self.assertEqual(response.status_code, 200, "Export should return 200 OK")
+        export_id = response.headers["X-Export-Id"]
+        
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO sms (address, body, date, type) VALUES ('+1234567890', 'Later message', 1625356800000, 1)")
+        conn.commit()
+        conn.close()
+        with open(self.db_file, "rb") as f:
+            response = requests.post(
+                f"{API_URL}/cases/{self.case_id}/upload",
+                files={"file": ("test_forensics_later.db", f, "application/octet-stream")}
+            )
+        self.wait_for_job(response.json()["job_id"])
+        
+        response = requests.post(f"{API_URL}/cases/{self.case_id}/verify")
+        self.assertEqual(response.status_code, 200, "Verification should start")
+        data = response.json()
+        self.assertGreater(data["items"], 0, "The case should have items to verify")
+        
+        job = self.wait_for_job(data["job_id"])
+        self.assertEqual(job["status"], "done", "Verification job should finish")
+        stats = job["stats"]
+        self.assertEqual(stats["failed"], 0, "No stored file should fail verification")
+        self.assertEqual(stats["passed"] + stats["missing"], stats["items"], "Every item should be reported")
+        
+        evidence = [result for result in job["results"] if result["kind"] == "evidence"]
+        self.assertTrue(evidence, "Stored evidence should be verified")
+        for result in evidence:
+            self.assertEqual(result["status"], "pass", "Stored evidence should match its recorded hash")
+            self.assertEqual(result["sha512"], result["expected_sha512"], "SHA-512 should match")
+            self.assertIn("sha256", result, "SHA-256 should be reported")
+            self.assertIn("md5", result, "MD5 should be reported")
+        
+        export = next(result for result in job["results"] if result["id"] == export_id)
+        self.assertEqual(export["status"], "pass", "Past exports should be re-verified after evidence changes")
+        
+        response = requests.post(f"{API_URL}/cases/nonexistent-case/verify")
+        self.assertEqual(response.status_code, 404, "Unknown cases should return 404")
+        
+        print(f"✅ Verified {stats['items']} items at {stats['bytes_per_second']} bytes/s")
+
+    def test_23_delta_ingest(self):
+        """Test delta ingest of repeated acquisitions of one device"""
+        print("\n--- Testing Delta Ingest API ---")
+        
+        # Ensure we have a case_id
+        if not self.case_id:
+            self.test_02_create_case()
+        
+        def upload():
+            with open(self.db_file, "rb") as f:
+                response = requests.post(
+                    f"{API_URL}/cases/{self.case_id}/upload",
+                    files={"file": ("test_forensics.db", f, "application/octet-stream")},
+                    data={"delta": "true", "device_id": "test-device"}
+                )
+            self.assertEqual(response.status_code, 200, "Delta upload should return 200 OK")
+            data = response.json()
+            self.assertNotIn("cache_hit", data, "Delta uploads should never be served from the cache")
+            job = self.wait_for_job(data["job_id"])
+            self.assertEqual(job["status"], "done", "Delta ingest should finish")
+            return data["evidence_id"], job["summary"]
+        
+        first_id, first = upload()
+        self.assertEqual(first["messages_count"], 3, "The first acquisition should be ingested in full")
+        
+        _, second = upload()
+        self.assertEqual(sum(second.values()), 0, "An unchanged acquisition should add no records")
+        
+        # A later acquisition holds one new message
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO sms (address, body, date, type) VALUES ('+1234567890', 'New message', 1625356800000, 1)")
+        conn.commit()
+        conn.close()
+        third_id, third = upload()
+        self.assertEqual(third, {"messages_count": 1, "contacts_count": 0, "call_logs_count": 0}, "Only the new row should be stored")
+        
+        # Deleting the latest acquisition rewinds the marks to where it started
+        response = requests.delete(f"{API_URL}/cases/{self.case_id}/evidence/{third_id}")
+        self.assertEqual(response.status_code, 200, "Evidence deletion should return 200 OK")
+        _, again = upload()
+        self.assertEqual(again, third, "Only the deleted acquisition's rows should be stored again")
+        
+        # Earlier acquisitions cannot be rewound while later ones build on them
+        response = requests.delete(f"{API_URL}/cases/{self.case_id}/evidence/{first_id}")
+        self.assertEqual(response.status_code, 409, "Deleting an earlier acquisition should be refused")
+        
+        with open(self.db_file, "rb") as f:
+            response = requests.post(
+                f"{API_URL}/cases/{self.case_id}/upload",
+                files={"file": ("test_forensics.db", f, "application/octet-stream")},
+                data={"delta": "true"}
+            )
+        self.assertEqual(response.status_code, 400, "Delta ingest without a device_id should be rejected")
+        
+        response = requests.post(
+            f"{API_URL}/cases/{self.case_id}/upload",
+            files={"file": ("backup.zip", b"PK", "application/zip")},
+            data={"delta": "true"}
+        )
+        self.assertEqual(response.status_code, 400, "Delta ingest of archives should be rejected")
+        
+        print("✅ Delta ingest stored only rows added since the previous acquisition")
+
+class TestSQLiteExtraction(unittest.TestCase):
+    """Test suite for the bounded-memory SQLite extractor in backend/server.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the backend module directly"""
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+        import server
+        cls.server = server
+
+    def setUp(self):
+        self.db_files = []
+
+    def tearDown(self):
+        for db_file in self.db_files:
+            if os.path.exists(db_file):
+                os.remove(db_file)
+
+    def create_sms_db(self, rows):
+        """Create an SQLite database with an sms table of the given size"""
+        fd, db_file = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db_files.append(db_file)
+        
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE sms (_id INTEGER PRIMARY KEY, address TEXT, body TEXT, date INTEGER, type INTEGER)")
+        conn.executemany(
+            "INSERT INTO sms (address, body, date, type) VALUES (?, ?, ?, ?)",
+            ((f"+1555{i % 10000:04d}", f"Message body number {i}", 1625097600000 + i, 1) for i in range(rows))
+        )
+        conn.commit()
+        conn.close()
+        return db_file
+
+    def extract_with_peak_memory(self, db_file):
+        """Consume every batch from the extractor, returning the row count and peak traced memory"""
+        tracemalloc.start()
+        rows = 0
+        for data_type, records in self.server.iter_sqlite_records(db_file):
+            self.assertEqual(data_type, "messages", "Only the sms table should be extracted")
+            rows += len(records)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return rows, peak
+
+    def test_peak_memory_stays_flat(self):
+        """Peak memory should not grow with table size"""
+        print("\n--- Testing SQLite Extraction Memory ---")
+        small_rows, small_peak = self.extract_with_peak_memory(self.create_sms_db(10000))
+        large_rows, large_peak = self.extract_with_peak_memory(self.create_sms_db(200000))
+        
+        self.assertEqual(small_rows, 10000, "Should extract every row of the small table")
+        self.assertEqual(large_rows, 200000, "Should extract every row of the large table")
+        self.assertLess(
+            large_peak, small_peak * 1.5,
+            f"Peak memory grew from {small_peak} to {large_peak} bytes for a 20x larger table"
+        )
+        print(f"✅ Peak memory {small_peak} bytes for 10K rows, {large_peak} bytes for 200K rows")
+
+    def test_evidence_is_not_modified(self):
+        """Extraction should open evidence read-only and leave it byte-for-byte intact"""
+        db_file = self.create_sms_db(100)
+        with open(db_file, 'rb') as f:
+            before = hashlib.sha512(f.read()).hexdigest()
+        
+        rows = sum(len(records) for _, records in self.server.iter_sqlite_records(db_file))
+        
+        with open(db_file, 'rb') as f:
+            after = hashlib.sha512(f.read()).hexdigest()
+        self.assertEqual(rows, 100, "Should extract every row")
+        self.assertEqual(before, after, "Evidence file should not change")
+        self.assertFalse(os.path.exists(db_file + "-journal"), "No journal should be created")
+
+class TestBackupExtraction(unittest.TestCase):
+    """Test suite for the parallel backup archive extractor in backend/server.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the backend module directly"""
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+        import server
+        cls.server = server
+
+    def setUp(self):
+        self.scratch_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    def create_sqlite_bytes(self, table, rows):
+        """Build a small SQLite database holding ``rows`` rows of one table"""
+        db_file = os.path.join(self.scratch_dir, f"{table}_{rows}.sqlite")
+        conn = sqlite3.connect(db_file)
+        conn.execute(f"CREATE TABLE {table} (_id INTEGER PRIMARY KEY, number TEXT, date INTEGER)")
+        conn.executemany(f"INSERT INTO {table} (number, date) VALUES (?, ?)", ((f"+1555{i:04d}", i) for i in range(rows)))
+        conn.commit()
+        conn.close()
+        with open(db_file, "rb") as f:
+            data = f.read()
+        os.remove(db_file)
+        return data
+
+    def create_backup(self):
+        """Build a backup archive whose members are written out of name order"""
+        archive_path = os.path.join(self.scratch_dir, "backup.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("z/mmssms.db", self.create_sqlite_bytes("sms", 7))
+            archive.writestr("m/AddressBook.plist", plistlib.dumps({"name": "John Doe", "phone": "+1234567890"}))
+            archive.writestr("a/calllog.db", self.create_sqlite_bytes("calls", 5))
+            archive.writestr("q/readme.txt", b"not evidence")
+            archive.writestr("c/3d0d7e5fb2ce288813306e4d4636395e047a3d28", self.create_sqlite_bytes("calls", 3))
+            for i in range(20):
+                archive.writestr(f"f/{19 - i:02d}.bin", os.urandom(64))
+        return archive_path
+
+    def extract(self, archive_path, workers):
+        """Run the backup extractor with the given worker count"""
+        members = []
+        with unittest.mock.patch.object(self.server, "BACKUP_PARSE_WORKERS", workers):
+            batches = list(self.server.iter_backup_records(archive_path, self.scratch_dir, members))
+        return batches, members
+
+    def test_merged_order_is_deterministic(self):
+        """Parallel parsing should yield the same batches and members, in name order, as a serial run"""
+        print("\n--- Testing Backup Extraction Order ---")
+        archive_path = self.create_backup()
+        serial_batches, serial_members = self.extract(archive_path, 1)
+        
+        names = [member["name"] for member in serial_members]
+        self.assertEqual(names, sorted(names), "Members should be processed in name order")
+        self.assertEqual(len(names), 25, "Every file member should get an integrity record")
+        self.assertEqual(
+            [(data_type, len(records)) for data_type, records in serial_batches],
+            [("call_logs", 5), ("call_logs", 3), ("contacts", 1), ("messages", 7)],
+            "Batches should follow member order"
+        )
+        
+        for _ in range(3):
+            parallel_batches, parallel_members = self.extract(archive_path, 3)
+            self.assertEqual(parallel_batches, serial_batches, "Parallel batches should match the serial run")
+            self.assertEqual(parallel_members, serial_members, "Parallel member records should match the serial run")
+        
+        print(f"✅ {len(serial_batches)} batches from {len(names)} members replayed in a fixed order")
+
+class TestRecordDeduplication(unittest.TestCase):
+    """Test suite for export deduplication in backend/server.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the backend module directly"""
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+        import server
+        cls.server = server
+
+    def test_stable_fields_ignore_provenance(self):
+        """Records matching on every stable field are duplicates whatever their source"""
+        deduplicator = self.server.RecordDeduplicator("messages")
+        first = {"_id": 1, "address": "+1234567890", "date": 100, "body": "hello", "table": "sms"}
+        copy = {"_id": 7, "address": "+1234567890", "date": 100, "body": "hello", "table": "messages"}
+        
+        self.assertTrue(deduplicator.is_new(first), "The first record should be kept")
+        self.assertFalse(deduplicator.is_new(copy), "A copy from another table should be dropped")
+        self.assertEqual(deduplicator.dropped, 1, "The dropped record should be counted")
+
+    def test_partial_stable_fields_are_not_merged(self):
+        """Records lacking some stable fields are compared on all their fields"""
+        messages = self.server.RecordDeduplicator("messages")
+        self.assertTrue(messages.is_new({"text": "hello", "date": 100}), "The first message should be kept")
+        self.assertTrue(messages.is_new({"text": "different", "date": 100}), "A different message at the same time should be kept")
+        self.assertFalse(messages.is_new({"_id": 2, "text": "hello", "date": 100}), "An exact copy should be dropped")
+        
+        contacts = self.server.RecordDeduplicator("contacts")
+        self.assertTrue(contacts.is_new({"name": "John", "phone_number": "+1234567890"}), "The first contact should be kept")
+        self.assertTrue(contacts.is_new({"name": "John", "phone_number": "+9876543210"}), "Another person with the same name should be kept")
+        self.assertEqual(contacts.dropped, 0, "No contact should be dropped")
+
+    def test_spill_to_disk(self):
+        """Fingerprints past the memory limit move to an on-disk set without changing the outcome"""
+        deduplicator = self.server.RecordDeduplicator("call_logs", memory_limit=10)
+        records = [{"number": f"+1555{i:04d}", "date": i, "duration": i, "type": 1} for i in range(50)]
+        try:
+            kept = [record for record in records + records if deduplicator.is_new(record)]
+            self.assertIsNotNone(deduplicator.spill, "Fingerprints should have spilled to disk")
+            self.assertTrue(os.path.exists(deduplicator.spill_path), "The spill file should exist while in use")
+            self.assertEqual(kept, records, "Every distinct record should be kept once, in order")
+            self.assertEqual(deduplicator.dropped, 50, "Every repeat should be counted")
+        finally:
+            deduplicator.close()
+        self.assertFalse(os.path.exists(deduplicator.spill_path), "The spill file should be removed on close")
+
+    def test_duplicates_dropped_accounting(self):
+        """Exports report the duplicates dropped per data type"""
+        records = {
+            "messages": [{"address": "+1", "date": 1, "body": "a"}, {"address": "+1", "date": 1, "body": "a"}],
+            "call_logs": [{"number": "+1", "date": 1, "duration": 5, "type": 1}] * 3
+        }
+        metadata = {"case_id": "case", "deduplicate": True}
+        dropped = {}
+        with unittest.mock.patch.object(self.server, "iter_case_records", lambda case_id, data_type: iter(records[data_type])):
+            kept = {data_type: list(self.server.iter_export_records(metadata, data_type, dropped)) for data_type in records}
+        
+        self.assertEqual({data_type: len(rows) for data_type, rows in kept.items()}, {"messages": 1, "call_logs": 1})
+        self.assertEqual(dropped, {"messages": 1, "call_logs": 2}, "Dropped duplicates should be counted per data type")
+
+class TestColumnarTypes(unittest.TestCase):
+    """Test suite for Arrow column typing in backend/server.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the backend module directly"""
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+        import server
+        cls.server = server
+
+    def test_mixed_bool_int_column(self):
+        """Columns mixing bools and integers should convert to Arrow integers"""
+        arrow_type = self.server._arrow_type({"bool", "int", "NoneType"})
+        values = [True, 5, None, False]
+        column = self.server.pa.array([self.server._arrow_value(value, arrow_type) for value in values], type=arrow_type)
+        self.assertEqual(column.to_pylist(), [1, 5, None, 0], "Bools should be stored as 0 and 1")
+
+    def test_wide_int_float_column(self):
+        """Columns mixing floats and integers beyond 2**53 should not convert to Arrow floats"""
+        server = self.server
+        values = [1.5, 2 ** 53 + 1, None]
+        records = lambda metadata, data_type, dropped: ({"value": value} for value in values)
+        with unittest.mock.patch.object(server, "iter_export_records", records), tempfile.TemporaryFile() as spool:
+            schema, _ = server._spool_record_batches({}, "messages", spool, {})
+        arrow_type = schema.field("value").type
+        self.assertEqual(arrow_type, server.pa.string(), "The column should fall back to strings")
+        column = server.pa.array([server._arrow_value(value, arrow_type) for value in values], type=arrow_type)
+        self.assertEqual(column.to_pylist(), ["1.5", str(2 ** 53 + 1), None], "No value should lose precision")
+        self.assertEqual(server._arrow_type({"int", "wideint"}), server.pa.int64(), "Wide integers alone should stay int64")
+
 def run_tests():
     """Run all tests"""
     # Create test suite
@@ -452,6 +1263,29 @@ def run_tests():
     suite.addTest(TestCyberForensicsBackend('test_07_export_csv'))
     suite.addTest(TestCyberForensicsBackend('test_08_export_history'))
     suite.addTest(TestCyberForensicsBackend('test_09_error_handling'))
+    suite.addTest(TestCyberForensicsBackend('test_10_upload_backup_zip'))
+    suite.addTest(TestCyberForensicsBackend('test_11_duplicate_upload_cache'))
+    suite.addTest(TestCyberForensicsBackend('test_12_search_messages'))
+    suite.addTest(TestCyberForensicsBackend('test_13_browse_records'))
+    suite.addTest(TestCyberForensicsBackend('test_14_query_plans'))
+    suite.addTest(TestCyberForensicsBackend('test_15_case_timeline'))
+    suite.addTest(TestCyberForensicsBackend('test_16_metrics'))
+    suite.addTest(TestCyberForensicsBackend('test_17_cached_export'))
+    suite.addTest(TestCyberForensicsBackend('test_18_export_ndjson'))
+    suite.addTest(TestCyberForensicsBackend('test_19_export_columnar'))
+    suite.addTest(TestCyberForensicsBackend('test_20_blob_offload'))
+    suite.addTest(TestCyberForensicsBackend('test_21_resumable_upload'))
+    suite.addTest(TestCyberForensicsBackend('test_22_verify_integrity'))
+    suite.addTest(TestCyberForensicsBackend('test_23_delta_ingest'))
+    suite.addTest(TestSQLiteExtraction('test_peak_memory_stays_flat'))
+    suite.addTest(TestSQLiteExtraction('test_evidence_is_not_modified'))
+    suite.addTest(TestBackupExtraction('test_merged_order_is_deterministic'))
+    suite.addTest(TestRecordDeduplication('test_stable_fields_ignore_provenance'))
+    suite.addTest(TestRecordDeduplication('test_partial_stable_fields_are_not_merged'))
+    suite.addTest(TestRecordDeduplication('test_spill_to_disk'))
+    suite.addTest(TestRecordDeduplication('test_duplicates_dropped_accounting'))
+    suite.addTest(TestColumnarTypes('test_mixed_bool_int_column'))
+    suite.addTest(TestColumnarTypes('test_wide_int_float_column'))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -48,9 +48,31 @@ const api = {
         'Content-Type': 'multipart/form-data',
       },
     });
+    const upload = await response.json();
+    if (!upload.success) {
+      return upload;
+    }
+    
+    // Parsing runs as a background job; wait for it to finish
+    const job = await api.waitForJob(upload.job_id);
+    return { ...upload, success: job.status === 'done', status: job.status, summary: job.summary };
+  },
+  
+  async getJob(jobId) {
+    const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}`);
     return response.json();
   },
   
+  async waitForJob(jobId, intervalMs = 1000) {
+    for (;;) {
+      const { job } = await api.getJob(jobId);
+      if (job.status === 'done' || job.status === 'failed') {
+        return job;
+      }
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+  },
+  
   async getCaseEvidence(caseId) {
     const response = await fetch(`${API_BASE_URL}/api/cases/${caseId}/evidence`);
     return response.json();
@@ -72,19 +94,30 @@ const api = {
       
       // Save to device downloads
       const downloadUri = FileSystem.documentDirectory + filename;
+      // Exports may be binary (CSV exports are ZIP archives), so write them as base64
       const reader = new FileReader();
       reader.onload = async () => {
-        await FileSystem.writeAsStringAsync(downloadUri, reader.result, {
-          encoding: FileSystem.EncodingType.UTF8,
+        await FileSystem.writeAsStringAsync(downloadUri, reader.result.split(',')[1], {
+          encoding: FileSystem.EncodingType.Base64,
         });
         Alert.alert('Export Complete', `File saved as ${filename}`);
       };
-      reader.readAsText(blob);
+      reader.readAsDataURL(blob);
       
-      return { success: true, hash: response.headers.get('X-Export-Hash') };
+      // Streamed exports record their hash once the download completes
+      const hash = response.headers.get('X-Export-Hash') ||
+        await api.getExportHash(exportRequest.case_id, response.headers.get('X-Export-Id'));
+      return { success: true, hash };
     }
     
     throw new Error('Export failed');
+  },
+  
+  async getExportHash(caseId, exportId) {
+    const response = await fetch(`${API_BASE_URL}/api/exports/${caseId}`);
+    const { exports } = await response.json();
+    const record = exports.find(e => e.export_id === exportId);
+    return record ? record.file_hash : null;
   }
 };
 
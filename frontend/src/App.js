@@ -30,9 +30,31 @@ const api = {
       method: 'POST',
       body: formData
     });
+    const upload = await response.json();
+    if (!upload.success) {
+      return upload;
+    }
+    
+    // Parsing runs as a background job; wait for it to finish
+    const job = await api.waitForJob(upload.job_id);
+    return { ...upload, success: job.status === 'done', status: job.status, summary: job.summary };
+  },
+  
+  async getJob(jobId) {
+    const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}`);
     return response.json();
   },
   
+  async waitForJob(jobId, intervalMs = 1000) {
+    for (;;) {
+      const { job } = await api.getJob(jobId);
+      if (job.status === 'done' || job.status === 'failed') {
+        return job;
+      }
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+  },
+  
   async getCaseEvidence(caseId) {
     const response = await fetch(`${API_BASE_URL}/api/cases/${caseId}/evidence`);
     return response.json();
@@ -61,10 +83,20 @@ const api = {
       window.URL.revokeObjectURL(url);
       document.body.removeChild(a);
       
-      return { success: true, hash: response.headers.get('X-Export-Hash') };
+      // Streamed exports record their hash once the download completes
+      const hash = response.headers.get('X-Export-Hash') ||
+        await api.getExportHash(exportRequest.case_id, response.headers.get('X-Export-Id'));
+      return { success: true, hash };
     }
     
     throw new Error('Export failed');
+  },
+  
+  async getExportHash(caseId, exportId) {
+    const response = await fetch(`${API_BASE_URL}/api/exports/${caseId}`);
+    const { exports } = await response.json();
+    const record = exports.find(e => e.export_id === exportId);
+    return record ? record.file_hash : null;
   }
 };
 
@@ -220,6 +252,7 @@ function CaseDetail({ caseId }) {
   const [uploadingFile, setUploadingFile] = useState(false);
   const [selectedDataTypes, setSelectedDataTypes] = useState([]);
   const [exportFormat, setExportFormat] = useState('json');
+  const [deduplicate, setDeduplicate] = useState(false);
 
   useEffect(() => {
     loadCaseData();
@@ -281,7 +314,8 @@ function CaseDetail({ caseId }) {
       const response = await api.exportData({
         case_id: caseId,
         data_types: selectedDataTypes,
-        export_format: exportFormat
+        export_format: exportFormat,
+        deduplicate
       });
       
       if (response.success) {
@@ -437,10 +471,23 @@ function CaseDetail({ caseId }) {
                 className="forensics-input"
               >
                 <option value="json">JSON</option>
-                <option value="csv">CSV</option>
+                <option value="ndjson">NDJSON</option>
+                <option value="csv">CSV (ZIP)</option>
+                <option value="parquet">Parquet (ZIP)</option>
+                <option value="arrow">Arrow IPC (ZIP)</option>
               </select>
             </div>
 
+            <label className="flex items-center text-sm">
+              <input
+                type="checkbox"
+                checked={deduplicate}
+                onChange={(e) => setDeduplicate(e.target.checked)}
+                className="mr-2"
+              />
+              Remove duplicate records across evidence
+            </label>
+
             <button
               onClick={handleExport}
               disabled={selectedDataTypes.length === 0}
@@ -516,7 +563,9 @@ function About() {
             <h3 className="text-xl font-semibold mb-3">Export Formats</h3>
             <ul className="space-y-2 text-gray-700">
               <li>• <strong>JSON:</strong> Structured data format for programmatic analysis</li>
-              <li>• <strong>CSV:</strong> Spreadsheet format for human review and reporting</li>
+              <li>• <strong>NDJSON:</strong> One record per line for streaming into other tools and pipelines</li>
+              <li>• <strong>CSV:</strong> ZIP of one spreadsheet per data type for human review and reporting</li>
+              <li>• <strong>Parquet / Arrow:</strong> ZIP of one typed, compressed columnar file per data type for pandas, DuckDB and other analytics tools</li>
             </ul>
           </section>
 